@@ -14,3 +14,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobroleprediction.settings')
 
 application = get_asgi_application()
+
+# Start the prediction micro-batcher with the worker instead of on the first request
+from django.conf import settings  # noqa: E402
+
+if settings.PREDICTION_MICRO_BATCHING:
+    from prediction.batching import inference_batcher
+
+    inference_batcher.start()
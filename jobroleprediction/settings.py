@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 import dj_database_url
 
@@ -22,6 +23,9 @@ load_dotenv()
 ADZUNA_APP_ID = os.environ.get('ADZUNA_APP_ID')
 ADZUNA_APP_KEY = os.environ.get('ADZUNA_APP_KEY')
 GOOGLE_API_KEY = os.environ.get('GOOGLE_API_KEY')
+# Point these at 'manage.py run_api_stub' for load tests
+ADZUNA_SEARCH_URL = os.environ.get('ADZUNA_SEARCH_URL', 'https://api.adzuna.com/v1/api/jobs/in/search/1')
+GOOGLE_SEARCH_URL = os.environ.get('GOOGLE_SEARCH_URL', 'https://www.googleapis.com/customsearch/v1')
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -121,6 +125,32 @@ SESSION_ENGINE = 'django.contrib.sessions.backends.db'  # Ensure session storage
 
 
 
+# Cache configuration. The default cache holds state every worker must agree on
+# (quiz, taxonomy and learning plan versions, single-flight locks), so it has to
+# be shared between processes: a database table unless CACHE_BACKEND says
+# otherwise (e.g. django.core.cache.backends.redis.RedisCache with a redis://
+# CACHE_LOCATION). Create the table once with 'manage.py createcachetable'.
+# Workers re-read the version tokens at most every VERSION_TOKEN_TTL seconds, so
+# the request path doesn't pay a cache round trip for them; edits reach other
+# workers within that delay.
+VERSION_TOKEN_TTL = float(os.environ.get('VERSION_TOKEN_TTL', 5))
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'careervision_cache'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000))},
+    },
+    'predictions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'PREDICTION_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'careervision_prediction_cache')
+        ),
+        'TIMEOUT': 24 * 3600,
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 
@@ -166,6 +196,75 @@ REST_FRAMEWORK = {
     'DATETIME_FORMAT': '%Y-%m-%dT%H:%M:%S.%fZ',
 }
 
+# Prediction model artifacts; workers poll the manifest for new versions
+PREDICTION_MODEL_DIR = os.environ.get('PREDICTION_MODEL_DIR', os.path.join(BASE_DIR, 'prediction', 'models'))
+PREDICTION_MODEL_RELOAD_INTERVAL = int(os.environ.get('PREDICTION_MODEL_RELOAD_INTERVAL', 30))
+# Serve the MLP from memory-mapped weights when 'manage.py export_mlp_weights' has run
+PREDICTION_NUMPY_ENGINE = os.environ.get('PREDICTION_NUMPY_ENGINE', 'True') == 'True'
+# Serve from the folded encoder/scaler/first-layer artifact written by 'manage.py compile_model'
+PREDICTION_COMPILED_MODEL = os.environ.get('PREDICTION_COMPILED_MODEL', 'True') == 'True'
+
+# Precomputed prediction table written by 'manage.py build_prediction_table'
+PREDICTION_TABLE_PATH = os.environ.get(
+    'PREDICTION_TABLE_PATH', os.path.join(PREDICTION_MODEL_DIR, 'prediction_table.npy')
+)
+
+# Memoized predictions: per-process LRU in front of a cache shared by all workers
+PREDICTION_CACHE_ALIAS = 'predictions'
+PREDICTION_CACHE_LOCAL_SIZE = int(os.environ.get('PREDICTION_CACHE_LOCAL_SIZE', 4096))
+PREDICTION_CACHE_TTL = int(os.environ.get('PREDICTION_CACHE_TTL', 24 * 3600))
+
+# Batch prediction API: rows scored per encoder/scaler/model pass and request cap
+PREDICTION_BATCH_CHUNK_SIZE = int(os.environ.get('PREDICTION_BATCH_CHUNK_SIZE', 1000))
+PREDICTION_BATCH_MAX_RECORDS = int(os.environ.get('PREDICTION_BATCH_MAX_RECORDS', 20000))
+
+# Micro-batching: coalesce concurrent single predictions into one model call
+PREDICTION_MICRO_BATCHING = os.environ.get('PREDICTION_MICRO_BATCHING', 'False') == 'True'
+PREDICTION_BATCH_MAX_SIZE = int(os.environ.get('PREDICTION_BATCH_MAX_SIZE', 32))
+PREDICTION_BATCH_MAX_WAIT_MS = float(os.environ.get('PREDICTION_BATCH_MAX_WAIT_MS', 2))
+
+# Quiz: pre-drawn shuffled variants (all questions each when QUIZ_QUESTIONS_PER_VARIANT is 0)
+QUIZ_VARIANT_COUNT = int(os.environ.get('QUIZ_VARIANT_COUNT', 8))
+QUIZ_QUESTIONS_PER_VARIANT = int(os.environ.get('QUIZ_QUESTIONS_PER_VARIANT', 0))
+
+# Adzuna job listings: served from cache and refreshed out of band (seconds)
+JOB_LISTINGS_FRESHNESS = int(os.environ.get('JOB_LISTINGS_FRESHNESS', 3600))
+JOB_LISTINGS_MAX_STALE = int(os.environ.get('JOB_LISTINGS_MAX_STALE', 7 * 24 * 3600))
+# Listings fetched per role category into the local JobListing store, and how long they are kept
+JOB_LISTINGS_FETCH_SIZE = int(os.environ.get('JOB_LISTINGS_FETCH_SIZE', 50))
+JOB_LISTINGS_RETENTION_DAYS = int(os.environ.get('JOB_LISTINGS_RETENTION_DAYS', 60))
+JOB_LISTINGS_PAGE_SIZE = int(os.environ.get('JOB_LISTINGS_PAGE_SIZE', 20))
+# Seconds before a role category whose fetch failed is tried again by any worker
+JOB_LISTINGS_NEGATIVE_TTL = int(os.environ.get('JOB_LISTINGS_NEGATIVE_TTL', 60))
+
+JOB_LISTINGS_REFRESH_INTERVAL = int(os.environ.get('JOB_LISTINGS_REFRESH_INTERVAL', 900))
+# In-process scheduler; turn off when 'manage.py refresh_job_listings' runs from cron instead
+JOB_LISTINGS_REFRESHER = os.environ.get('JOB_LISTINGS_REFRESHER', 'True') == 'True'
+
+# Single-flight fetches: how long the cross-worker lock lives and how long followers wait on it
+SINGLE_FLIGHT_LOCK_TTL = int(os.environ.get('SINGLE_FLIGHT_LOCK_TTL', 60))
+SINGLE_FLIGHT_WAIT = int(os.environ.get('SINGLE_FLIGHT_WAIT', 30))
+
+# Outbound HTTP (Adzuna, Google): timeouts in seconds, retries with jittered backoff, circuit breaker
+HTTP_CLIENT_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CLIENT_CONNECT_TIMEOUT', 3.05))
+HTTP_CLIENT_READ_TIMEOUT = float(os.environ.get('HTTP_CLIENT_READ_TIMEOUT', 10))
+HTTP_CLIENT_RETRIES = int(os.environ.get('HTTP_CLIENT_RETRIES', 2))
+HTTP_CLIENT_BACKOFF = float(os.environ.get('HTTP_CLIENT_BACKOFF', 0.2))
+HTTP_CLIENT_POOL_SIZE = int(os.environ.get('HTTP_CLIENT_POOL_SIZE', 10))
+HTTP_CLIENT_BREAKER_THRESHOLD = int(os.environ.get('HTTP_CLIENT_BREAKER_THRESHOLD', 5))
+HTTP_CLIENT_BREAKER_RESET = float(os.environ.get('HTTP_CLIENT_BREAKER_RESET', 30))
+
+# Learning plans look up each gap skill's resources concurrently; skills still
+# pending after the deadline (seconds) get the generic fallback resources
+SKILL_RESOURCE_WORKERS = int(os.environ.get('SKILL_RESOURCE_WORKERS', 8))
+SKILL_RESOURCE_DEADLINE = float(os.environ.get('SKILL_RESOURCE_DEADLINE', 3))
+# Seconds a memoized learning plan is reused before it is rebuilt with fresh search results
+LEARNING_PLAN_TTL = int(os.environ.get('LEARNING_PLAN_TTL', 24 * 3600))
+# Google Custom Search results are stored in the database (CachedSearch) for this
+# many seconds, keeping at most this many queries; least recently used go first
+GOOGLE_SEARCH_CACHE_TTL = int(os.environ.get('GOOGLE_SEARCH_CACHE_TTL', 7 * 24 * 3600))
+GOOGLE_SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get('GOOGLE_SEARCH_CACHE_MAX_ENTRIES', 5000))
+
 # CORS Configuration for Frontend Integration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # Next.js development server
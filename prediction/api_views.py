@@ -0,0 +1,150 @@
+import csv
+import io
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, parser_classes
+from rest_framework.parsers import BaseParser, JSONParser, MultiPartParser
+from rest_framework.response import Response
+
+from .batching import inference_batcher
+from .http_client import http_client
+from .job_feed import encode_cursor, in_category, page_after, search_listings
+from .model_registry import ModelUnavailable, registry
+from .models import JobListing
+from .prediction_cache import prediction_cache
+from .predictor import build_feature_row, predict_batch
+from .serializers import JobListingSerializer
+
+
+class CSVParser(BaseParser):
+    """Parse a raw text/csv body into a list of row dicts"""
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        return list(csv.DictReader(io.StringIO(stream.read().decode(encoding))))
+
+
+def _extract_records(request):
+    """Accept a JSON list, a {"records": [...]} object, a CSV body or an uploaded CSV file"""
+    upload = request.FILES.get('file') if request.FILES else None
+    if upload is not None:
+        return list(csv.DictReader(io.StringIO(upload.read().decode('utf-8'))))
+
+    data = request.data
+    if isinstance(data, dict):
+        data = data.get('records')
+    if not isinstance(data, list):
+        raise ValueError("Expected a list of records")
+    return data
+
+
+@api_view(['POST'])
+@parser_classes([JSONParser, CSVParser, MultiPartParser])
+def predict_batch_view(request):
+    """Score a whole cohort of student records in one request"""
+    try:
+        records = _extract_records(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    max_records = settings.PREDICTION_BATCH_MAX_RECORDS
+    if len(records) > max_records:
+        return Response(
+            {'error': f'At most {max_records} records can be scored per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    rows = []
+    errors = []
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            errors.append({'index': index, 'error': 'Record must be an object'})
+            continue
+        try:
+            rows.append(build_feature_row(record))
+        except ValueError as e:
+            errors.append({'index': index, 'error': str(e)})
+
+    if errors:
+        return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        bundle = registry.get()
+    except ModelUnavailable as e:
+        return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    predictions = predict_batch(rows, bundle=bundle)
+    return Response({
+        'count': len(predictions),
+        'model_version': bundle.version,
+        'predictions': predictions,
+    })
+
+
+@api_view(['GET'])
+def model_status(request):
+    """Report which model version this worker serves, when it was loaded and cache hit rates"""
+    try:
+        registry.get()
+    except ModelUnavailable as e:
+        return Response(dict(registry.status(), error=str(e)), status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response(dict(
+        registry.status(),
+        prediction_cache=prediction_cache.stats(),
+        micro_batching=inference_batcher.stats(),
+    ))
+
+
+@api_view(['GET'])
+def upstream_status(request):
+    """Report latency, error and circuit breaker state for each outbound API used by this worker"""
+    return Response(http_client.stats())
+
+
+@api_view(['GET'])
+def job_listings(request):
+    """Page through stored job listings, newest first.
+
+    Filters: ``role`` (role category), ``location`` (prefix), ``posted_after``
+    (ISO date) and ``q`` (words that must all appear). Pass the returned
+    ``next_cursor`` as ``cursor`` for the next page.
+    """
+    listings = JobListing.objects.all()
+    params = request.query_params
+    try:
+        if params.get('role'):
+            listings = in_category(listings, params['role'])
+        if params.get('location'):
+            listings = listings.filter(location__istartswith=params['location'])
+        if params.get('posted_after'):
+            try:
+                posted_after = datetime.fromisoformat(params['posted_after'])
+            except ValueError:
+                raise ValueError(f"posted_after must be an ISO date, got {params['posted_after']!r}")
+            if timezone.is_naive(posted_after):
+                posted_after = timezone.make_aware(posted_after)
+            listings = listings.filter(posted_at__gte=posted_after)
+        if params.get('q'):
+            listings = search_listings(listings, params['q'])
+        if params.get('cursor'):
+            listings = page_after(listings, params['cursor'])
+        try:
+            page_size = int(params.get('page_size', settings.JOB_LISTINGS_PAGE_SIZE))
+        except ValueError:
+            raise ValueError(f"page_size must be a whole number, got {params['page_size']!r}")
+        page_size = max(1, min(page_size, 100))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # One extra row tells us whether there is a next page without a COUNT query
+    page = list(listings.order_by('-posted_at', '-id').prefetch_related('categories')[:page_size + 1])
+    has_next = len(page) > page_size
+    page = page[:page_size]
+    return Response({
+        'results': JobListingSerializer(page, many=True).data,
+        'next_cursor': encode_cursor(page[-1]) if has_next and page else None,
+    })
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBatcher:
+    """Coalesces concurrent single-row predictions into one model call.
+
+    Callers hand in a feature row and block (``predict``) or await
+    (``apredict``) the result. A background thread collects rows until it has
+    PREDICTION_BATCH_MAX_SIZE of them or PREDICTION_BATCH_MAX_WAIT_MS has passed
+    since the first one arrived, scores them with one ``predict_batch`` call
+    and resolves every caller's future.
+    """
+
+    def __init__(self, max_batch_size=None, max_wait_ms=None):
+        self._max_batch_size = max_batch_size
+        self._max_wait_ms = max_wait_ms
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'batches': 0, 'items': 0, 'largest_batch': 0, 'queue_wait_ms_total': 0.0}
+
+    @property
+    def max_batch_size(self):
+        return self._max_batch_size or settings.PREDICTION_BATCH_MAX_SIZE
+
+    @property
+    def max_wait(self):
+        return (self._max_wait_ms if self._max_wait_ms is not None else settings.PREDICTION_BATCH_MAX_WAIT_MS) / 1000
+
+    def start(self):
+        """Start the flush thread (again, if this process was forked after starting it)"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='inference-batcher', daemon=True)
+            self._thread.start()
+
+    def submit(self, row, bundle=None):
+        """Queue a feature row and return a Future for its scored result"""
+        from .model_registry import registry
+        self.start()
+        future = Future()
+        self._queue.put((bundle or registry.get(), row, future, time.monotonic()))
+        return future
+
+    def predict(self, row, bundle=None, timeout=None):
+        return self.submit(row, bundle).result(timeout)
+
+    async def apredict(self, row, bundle=None):
+        return await asyncio.wrap_future(self.submit(row, bundle))
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches = stats['batches'] or 1
+        return {
+            'enabled': settings.PREDICTION_MICRO_BATCHING,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': stats['batches'],
+            'items': stats['items'],
+            'largest_batch': stats['largest_batch'],
+            'mean_batch_size': round(stats['items'] / batches, 2),
+            'mean_queue_wait_ms': round(stats['queue_wait_ms_total'] / max(stats['items'], 1), 3),
+            'queued': self._queue.qsize(),
+        }
+
+    def _collect(self):
+        """Block for the first item, then gather more until the batch is full or the window closes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._flush(batch)
+            except Exception:
+                logger.exception("Inference batch failed")
+
+    def _flush(self, batch):
+        from .predictor import predict_batch
+
+        flushed_at = time.monotonic()
+        # Keep each model version's rows together so a hot reload never mixes versions
+        groups = {}
+        for item in batch:
+            groups.setdefault(id(item[0]), []).append(item)
+
+        for items in groups.values():
+            bundle = items[0][0]
+            try:
+                results = predict_batch([row for _, row, _, _ in items], bundle=bundle)
+            except Exception as e:
+                for _, _, future, _ in items:
+                    future.set_exception(e)
+                continue
+            for (_, _, future, _), result in zip(items, results):
+                future.set_result(result)
+
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['items'] += len(batch)
+            self._stats['largest_batch'] = max(self._stats['largest_batch'], len(batch))
+            self._stats['queue_wait_ms_total'] += sum(
+                (flushed_at - queued_at) * 1000 for _, _, _, queued_at in batch
+            )
+
+
+inference_batcher = InferenceBatcher()
@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class CompiledEncoder:
+    """Lookup-table version of a fitted OneHotEncoder.
+
+    Each input column gets a dict mapping a category to its output column, so a
+    feature row is encoded with a handful of dict lookups instead of building a
+    DataFrame. Categories are matched exactly like the fitted encoder matches
+    them (the string "5" does not match the integer category 5), and values the
+    encoder never saw are handled according to its ``handle_unknown`` setting.
+    """
+
+    def __init__(self, encoder):
+        if getattr(encoder, '_infrequent_enabled', False):
+            raise ValueError("Encoders with infrequent categories are not supported")
+
+        self.columns = [str(column) for column in encoder.feature_names_in_]
+        self.ignore_unknown = encoder.handle_unknown != 'error'
+        self.dtype = encoder.dtype
+
+        drop_idx = getattr(encoder, 'drop_idx_', None)
+        self.lookups = []
+        self.categories = []
+        offset = 0
+        for position, categories in enumerate(encoder.categories_):
+            dropped = None if drop_idx is None else drop_idx[position]
+            lookup = {}
+            for index, category in enumerate(categories):
+                key = category.item() if isinstance(category, np.generic) else category
+                if dropped is not None and index == dropped:
+                    lookup[key] = None
+                    continue
+                lookup[key] = offset
+                offset += 1
+            self.lookups.append(lookup)
+            self.categories.append([c.item() if isinstance(c, np.generic) else c for c in categories])
+        self.n_features = offset
+
+    def active_indices(self, row):
+        """Return the output columns set to 1 for a single feature row"""
+        indices = []
+        for column, lookup, value in zip(self.columns, self.lookups, row):
+            if value in lookup:
+                index = lookup[value]
+                if index is not None:
+                    indices.append(index)
+            elif not self.ignore_unknown:
+                raise ValueError(f"Found unknown category {value!r} in column '{column}'")
+        return indices
+
+    def transform(self, rows):
+        """Encode feature rows into a dense (n_rows, n_features) array"""
+        encoded = np.zeros((len(rows), self.n_features), dtype=self.dtype)
+        for position, row in enumerate(rows):
+            encoded[position, self.active_indices(row)] = 1
+        return encoded
@@ -0,0 +1,165 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying; anything else is returned to the caller as is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpen(requests.exceptions.RequestException):
+    """Raised without touching the network while an upstream's breaker is open"""
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures and lets one trial
+    request through every ``reset_timeout`` seconds until one succeeds."""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class Upstream:
+    """A keep-alive session, circuit breaker and counters for one external API"""
+
+    def __init__(self, name):
+        self.name = name
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=settings.HTTP_CLIENT_POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.breaker = CircuitBreaker(settings.HTTP_CLIENT_BREAKER_THRESHOLD, settings.HTTP_CLIENT_BREAKER_RESET)
+        self.counters = {'requests': 0, 'errors': 0, 'retries': 0, 'short_circuited': 0}
+        self.latencies = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    def _count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def request(self, method, url, timeout=None, retries=None, **kwargs):
+        """Send a request with retries and jittered backoff; raises RequestException once they run out"""
+        timeout = timeout or (settings.HTTP_CLIENT_CONNECT_TIMEOUT, settings.HTTP_CLIENT_READ_TIMEOUT)
+        retries = settings.HTTP_CLIENT_RETRIES if retries is None else retries
+
+        for attempt in range(retries + 1):
+            if not self.breaker.allow():
+                self._count('short_circuited')
+                raise CircuitOpen(f"Circuit for upstream '{self.name}' is open")
+            if attempt:
+                self._count('retries')
+                # Full jitter keeps workers that failed together from retrying together
+                time.sleep(random.uniform(0, settings.HTTP_CLIENT_BACKOFF * 2 ** (attempt - 1)))
+
+            self._count('requests')
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+                response = None
+            finally:
+                with self._lock:
+                    self.latencies.append(time.perf_counter() - started)
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                self.breaker.record_success()
+                return response
+
+            self._count('errors')
+            self.breaker.record_failure()
+            if response is not None and attempt == retries:
+                return response
+            if response is not None:
+                response.close()
+                error = requests.exceptions.HTTPError(f"{response.status_code} from {self.name}", response=response)
+            logger.warning(f"{self.name} request failed (attempt {attempt + 1}/{retries + 1}): {str(error)}")
+        raise error
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            latencies = list(self.latencies)
+        stats['circuit'] = self.breaker.state
+        if latencies:
+            stats['latency_ms'] = {
+                'p50': round(float(np.percentile(latencies, 50)) * 1000, 1),
+                'p95': round(float(np.percentile(latencies, 95)) * 1000, 1),
+                'max': round(max(latencies) * 1000, 1),
+            }
+        return stats
+
+
+class HttpClient:
+    """Shared outbound HTTP client; one pooled Upstream per external API name"""
+
+    def __init__(self):
+        self._upstreams = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def upstream(self, name):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Pooled sockets must not be shared with a forked parent
+                self._upstreams = {}
+                self._pid = os.getpid()
+            if name not in self._upstreams:
+                self._upstreams[name] = Upstream(name)
+            return self._upstreams[name]
+
+    def get(self, name, url, **kwargs):
+        return self.upstream(name).request('GET', url, **kwargs)
+
+    def stats(self):
+        with self._lock:
+            upstreams = dict(self._upstreams)
+        return {name: upstream.stats() for name, upstream in upstreams.items()}
+
+
+http_client = HttpClient()
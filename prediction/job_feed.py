@@ -0,0 +1,304 @@
+import base64
+import binascii
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from .http_client import http_client
+from .models import JobListing, JobListingCategory
+from .resource_search import MIN_TRIGRAM_LENGTH, fts_available
+from .single_flight import RecentlyFailed, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Map the predicted role categories to relevant job search terms
+JOB_SEARCH_MAPPING = {
+    'CRM/Managerial Roles': 'CRM Manager OR Project Manager',
+    'Analyst': 'Business Analyst OR Data Analyst',
+    'Mobile Applications/ Web Development': 'Web Developer OR Mobile Developer',
+    'QA/Testing': 'QA Engineer OR Software Tester',
+    'UX/Design': 'UX Designer OR UI Designer',
+    'Databases': 'Database Administrator OR Database Developer',
+    'Programming/ Systems Analyst': 'Systems Analyst OR Programmer',
+    'Networks/ Systems': 'Network Engineer OR Systems Administrator',
+    'SE/SDE': 'Software Engineer OR Software Developer',
+    'Technical Support/Service': 'Technical Support OR IT Support',
+    'others': 'IT Professional'
+}
+
+JOBS_PER_SEARCH = 5
+# Created by migration 0012_joblisting_search on SQLite builds with the trigram tokenizer
+LISTING_FTS_TABLE = 'prediction_joblisting_fts'
+# One Adzuna fetch per role category at a time across all workers
+job_fetches = SingleFlight('job_fetch')
+
+
+def search_term_for(job_category):
+    return JOB_SEARCH_MAPPING.get(job_category, job_category)
+
+
+def salary_text(salary_min, salary_max):
+    if salary_min and salary_max:
+        return f"₹{salary_min/100000:.1f}L - ₹{salary_max/100000:.1f}L"
+    elif salary_max:
+        return f"Up to ₹{salary_max/100000:.1f}L"
+    return "Salary not specified"
+
+
+def listing_card(listing):
+    """Turn a stored JobListing into the dict job.html renders"""
+    # Clean and truncate description
+    description = listing.description or 'No description available'
+    if len(description) > 300:
+        description = description[:300] + '...'
+
+    return {
+        'title': listing.title,
+        'company': listing.company or 'Company not specified',
+        'location': listing.location or 'Location not specified',
+        'description': description,
+        'salary': salary_text(listing.salary_min, listing.salary_max),
+        'url': listing.url,
+        'posted_date': listing.posted_at.strftime("%B %d, %Y")
+    }
+
+
+def parse_result(job):
+    """Build an unsaved JobListing from one Adzuna search result"""
+    posted_at = datetime.strptime(job['created'], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=dt_timezone.utc)
+    listing = JobListing(
+        adzuna_id=str(job['id']),
+        title=(job.get('title') or '')[:255],
+        company=(job.get('company', {}).get('display_name') or '')[:255],
+        location=(job.get('location', {}).get('display_name') or '')[:255],
+        description=job.get('description') or '',
+        salary_min=job.get('salary_min'),
+        salary_max=job.get('salary_max'),
+        url=job.get('redirect_url') or '',
+        posted_at=posted_at,
+        fetched_at=timezone.now(),
+    )
+    # bulk_create skips save(), so fill the search field here
+    listing.search_text = listing.build_search_text()
+    return listing
+
+
+def fetch_from_adzuna(search_term, num_jobs=None):
+    """Call the Adzuna search API and return its raw results; raises requests.RequestException on failure"""
+    params = {
+        'app_id': settings.ADZUNA_APP_ID,
+        'app_key': settings.ADZUNA_APP_KEY,
+        'results_per_page': num_jobs or settings.JOB_LISTINGS_FETCH_SIZE,
+        'what': search_term,
+        'content-type': 'application/json',
+        'sort_by': 'date',
+        'max_days_old': 30  # Only show jobs posted in last 30 days
+    }
+    response = http_client.get('adzuna', settings.ADZUNA_SEARCH_URL, params=params)
+    response.raise_for_status()
+    return response.json().get('results', [])
+
+
+def store_listings(job_category, results):
+    """Upsert search results into JobListing, de-duplicated on the Adzuna id.
+
+    A posting returned for several role categories is stored once and filed
+    under each of them; storing it again never drops an earlier category.
+    """
+    listings = {}
+    for job in results:
+        listing = parse_result(job)
+        listings[listing.adzuna_id] = listing
+    JobListing.objects.bulk_create(
+        listings.values(),
+        update_conflicts=True,
+        unique_fields=['adzuna_id'],
+        update_fields=[
+            'title', 'company', 'location', 'description', 'salary_min',
+            'salary_max', 'url', 'posted_at', 'fetched_at', 'search_text',
+        ],
+    )
+    # Upserted rows don't get their primary keys back on every backend
+    listing_ids = JobListing.objects.filter(adzuna_id__in=listings).values_list('pk', flat=True)
+    JobListingCategory.objects.bulk_create(
+        [JobListingCategory(listing_id=pk, role_category=job_category) for pk in listing_ids],
+        ignore_conflicts=True,
+    )
+    return len(listings)
+
+
+def fetched_key_for(job_category):
+    return f'jobs_fetched_{hashlib.sha1(search_term_for(job_category).encode()).hexdigest()}'
+
+
+def refresh_category(job_category):
+    """Fetch a role category from Adzuna into the local store; returns the number of listings"""
+    stored = store_listings(job_category, fetch_from_adzuna(search_term_for(job_category)))
+    cache.set(fetched_key_for(job_category), time.time(), settings.JOB_LISTINGS_MAX_STALE)
+    return stored
+
+
+def refresh_category_once(job_category):
+    """refresh_category, coalesced with any fetch of the same category already in flight.
+
+    A failed fetch is not retried by anyone for JOB_LISTINGS_NEGATIVE_TTL seconds.
+    """
+    return job_fetches.run(
+        search_term_for(job_category), lambda: refresh_category(job_category), settings.JOB_LISTINGS_NEGATIVE_TTL
+    )
+
+
+def prune_listings():
+    """Drop listings older than JOB_LISTINGS_RETENTION_DAYS"""
+    cutoff = timezone.now() - timedelta(days=settings.JOB_LISTINGS_RETENTION_DAYS)
+    return JobListing.objects.filter(posted_at__lt=cutoff).delete()[0]
+
+
+def in_category(listings, job_category):
+    return listings.filter(categories__role_category=job_category)
+
+
+def search_listings(listings, query):
+    """Keep listings whose search text contains every word of ``query``.
+
+    On SQLite the longer words go through the FTS5 trigram table as a single
+    MATCH; on Postgres each contains clause uses the trigram GIN index.
+    """
+    words = list(dict.fromkeys(query.lower().split()))
+    if fts_available(LISTING_FTS_TABLE):
+        indexed = [word for word in words if len(word) >= MIN_TRIGRAM_LENGTH]
+        plain = [word for word in words if len(word) < MIN_TRIGRAM_LENGTH]
+    else:
+        indexed, plain = [], words
+
+    for word in plain:
+        listings = listings.filter(search_text__contains=word)
+    if indexed:
+        match = ' AND '.join('"{}"'.format(word.replace('"', '""')) for word in indexed)
+        listings = listings.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {LISTING_FTS_TABLE} WHERE {LISTING_FTS_TABLE} MATCH %s', (match,)
+        ))
+    return listings
+
+
+def page_after(listings, cursor):
+    """Keyset pagination over (-posted_at, -id): rows strictly after the cursor's row"""
+    posted_at, pk = decode_cursor(cursor)
+    return listings.filter(Q(posted_at__lt=posted_at) | Q(posted_at=posted_at, pk__lt=pk))
+
+
+def encode_cursor(listing):
+    raw = f'{listing.posted_at.isoformat()}|{listing.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return (posted_at, id) from a cursor; raises ValueError when it is malformed"""
+    try:
+        posted_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(posted_at), int(pk)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+
+
+class JobRefresher:
+    """Keeps job listings warm so page views never wait on Adzuna.
+
+    ``cached_jobs`` serves whatever is in the JobListing store, however old,
+    and queues a background refresh when the role category was last fetched
+    more than JOB_LISTINGS_FRESHNESS seconds ago. When JOB_LISTINGS_REFRESHER is on, a
+    scheduler thread also re-fetches every role category's stale listings each
+    JOB_LISTINGS_REFRESH_INTERVAL seconds; otherwise run
+    ``manage.py refresh_job_listings`` from cron.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._scheduler = None
+        self._pid = None
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Threads don't survive a fork; start fresh ones in each worker
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='job-refresh')
+            self._in_flight = set()
+            self._pid = os.getpid()
+            if settings.JOB_LISTINGS_REFRESHER:
+                self._scheduler = threading.Thread(target=self._run_scheduler, name='job-refresh-scheduler', daemon=True)
+                self._scheduler.start()
+
+    def cached_jobs(self, job_category, limit=JOBS_PER_SEARCH):
+        """Return stored listings for a role category without calling Adzuna"""
+        self._ensure_started()
+        fetched_at = cache.get(fetched_key_for(job_category))
+        if fetched_at is None or time.time() - fetched_at > settings.JOB_LISTINGS_FRESHNESS:
+            self.schedule(job_category)
+        return [listing_card(listing) for listing in in_category(JobListing.objects.all(), job_category)[:limit]]
+
+    def schedule(self, job_category):
+        """Queue a background refresh unless one is running or just failed"""
+        self._ensure_started()
+        with self._lock:
+            if job_category in self._in_flight or job_fetches.recent_failure(search_term_for(job_category)):
+                return
+            self._in_flight.add(job_category)
+        self._executor.submit(self._refresh, job_category)
+
+    def _refresh(self, job_category):
+        try:
+            refresh_category_once(job_category)
+        except (requests.exceptions.RequestException, RecentlyFailed, ValueError, KeyError) as e:
+            logger.warning(f"Keeping stored jobs for '{job_category}', refresh failed: {str(e)}")
+        finally:
+            # Don't hold a database connection open in the pool thread
+            close_old_connections()
+            with self._lock:
+                self._in_flight.discard(job_category)
+
+    def refresh_stale(self, force=False):
+        """Synchronously refresh every role category whose listings are stale; returns failures"""
+        failures = {}
+        for job_category in JOB_SEARCH_MAPPING:
+            fetched_at = cache.get(fetched_key_for(job_category))
+            fresh = fetched_at is not None and time.time() - fetched_at <= settings.JOB_LISTINGS_FRESHNESS
+            if fresh and not force:
+                continue
+            try:
+                refresh_category_once(job_category)
+            except (requests.exceptions.RequestException, RecentlyFailed, ValueError, KeyError) as e:
+                failures[job_category] = str(e)
+        prune_listings()
+        return failures
+
+    def _run_scheduler(self):
+        while True:
+            try:
+                for search_term, error in self.refresh_stale().items():
+                    logger.warning(f"Job refresh for '{search_term}' failed: {error}")
+            except Exception:
+                logger.exception("Job refresh scheduler failed")
+            finally:
+                close_old_connections()
+            time.sleep(settings.JOB_LISTINGS_REFRESH_INTERVAL)
+
+
+job_refresher = JobRefresher()
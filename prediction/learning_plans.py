@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .models import UserSkillGapAnalysis
+from .skill_analyzer import SkillGapAnalyzer
+from .version_tokens import VersionToken
+
+logger = logging.getLogger(__name__)
+
+PLAN_VERSION_KEY = 'learning_plan_version'
+plan_token = VersionToken(PLAN_VERSION_KEY)
+# The session fields create_learning_plan reads; nothing else affects the plan
+PLAN_INPUT_FIELDS = (
+    'logical_quotient_rating', 'hackathons', 'coding_skills_rating', 'public_speaking_points',
+    'certifications', 'workshops', 'interested_subjects', 'team', 'management_technical',
+)
+NUMERIC_INPUT_FIELDS = {'logical_quotient_rating', 'hackathons', 'coding_skills_rating', 'public_speaking_points'}
+
+
+def plan_version():
+    """Token for the current learning resources; replaced whenever they change"""
+    return plan_token.get()
+
+
+def invalidate_learning_plans():
+    """Forget every memoized plan, cached and stored.
+
+    The token is part of every plan key, so stored analyses stay as a record
+    without being rewritten but are no longer reused.
+    """
+    plan_token.replace()
+
+
+def normalized_inputs(user_data):
+    """The plan-relevant session fields with numbers as ints, so '7' and 7 hash alike"""
+    inputs = {}
+    for field in PLAN_INPUT_FIELDS:
+        value = user_data.get(field)
+        if field in NUMERIC_INPUT_FIELDS:
+            inputs[field] = int(value or 0)
+        else:
+            inputs[field] = value or ''
+    return inputs
+
+
+def plan_key(job_role, user_data, taxonomy_version, resources_version):
+    """Content address of a learning plan: equal inputs give equal keys"""
+    payload = json.dumps(
+        [job_role, normalized_inputs(user_data), taxonomy_version, resources_version], sort_keys=True
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def stored_plan(key):
+    """The newest stored plan for ``key`` still within LEARNING_PLAN_TTL, or None"""
+    cutoff = timezone.now() - timedelta(seconds=settings.LEARNING_PLAN_TTL)
+    try:
+        analysis = (
+            UserSkillGapAnalysis.objects.filter(plan_key=key, created_at__gte=cutoff, learning_plan__isnull=False)
+            .only('learning_plan')
+            .order_by('-created_at')
+            .first()
+        )
+    except DatabaseError as e:
+        logger.error(f"Error reading stored learning plan: {str(e)}")
+        return None
+    return analysis.learning_plan if analysis else None
+
+
+def store_plan(key, learning_plan, session_id):
+    try:
+        UserSkillGapAnalysis.objects.create(
+            session_id=session_id or '',
+            job_role=learning_plan['job_role'],
+            current_skills=json.dumps(learning_plan['current_skills']),
+            required_skills=json.dumps(learning_plan['required_skills']),
+            skill_gaps=json.dumps(learning_plan['skill_gaps']),
+            plan_key=key,
+            learning_plan=learning_plan,
+        )
+    except DatabaseError as e:
+        logger.error(f"Error storing learning plan: {str(e)}")
+
+
+def learning_plan_for(user_data, job_role, session_id='', analyzer=None):
+    """create_learning_plan, memoized by job role, inputs and taxonomy version.
+
+    Plans are looked up in UserSkillGapAnalysis with one indexed query, so any
+    session with the same inputs reuses them; a copy in the default cache
+    would cost the same query there. Changing a LearningResource
+    or Skill (see signals.py) or the taxonomy retires every memoized plan.
+    Degraded plans, where a resource lookup timed out or failed and generic
+    resources stand in, are served but not memoized.
+    """
+    analyzer = analyzer or SkillGapAnalyzer()
+    key = plan_key(job_role, user_data, analyzer.taxonomy.version, plan_version())
+    learning_plan = stored_plan(key)
+    if learning_plan is None:
+        learning_plan = analyzer.create_learning_plan(user_data, job_role)
+        if not learning_plan.get('degraded'):
+            store_plan(key, learning_plan, session_id)
+    return learning_plan
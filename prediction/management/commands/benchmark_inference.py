@@ -0,0 +1,187 @@
+import json
+import os
+import pickle
+import random
+import time
+import warnings
+from urllib.parse import urlencode
+
+import numpy as np
+import pandas as pd
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from django.http import QueryDict
+
+from prediction.model_registry import ModelRegistry, ModelUnavailable, registry
+from prediction.predictor import FEATURE_COLUMNS, FEATURE_FIELDS, build_feature_row, job_roles
+
+# Session keys the prediction view stores for every submission
+SESSION_FIELDS = [
+    'hackathons', 'coding_skills_rating', 'public_speaking_points', 'certifications', 'workshops',
+    'interested_subjects', 'interested_career_area', 'Type_of_company_want_to_settle_in',
+    'management_technical', 'team', 'introvert',
+]
+
+
+def stand_in_model(n_features, seed=0):
+    """An MLP with the production architecture and classes, fitted on random data"""
+    from sklearn.exceptions import ConvergenceWarning
+    from sklearn.neural_network import MLPClassifier
+
+    rng = np.random.default_rng(seed)
+    classes = list(job_roles)
+    X = rng.normal(size=(len(classes) * 20, n_features))
+    y = [classes[i % len(classes)] for i in range(len(X))]
+    model = MLPClassifier(hidden_layer_sizes=(64, 32), max_iter=20, random_state=seed)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', ConvergenceWarning)
+        model.fit(X, y)
+    return model
+
+
+def summarize(timings, batch_size):
+    """Latency percentiles (ms per batch) and throughput (rows/s) for one stage"""
+    timings = np.array(timings)
+    return {
+        'runs': len(timings),
+        'p50_ms': round(float(np.percentile(timings, 50)) * 1000, 4),
+        'p95_ms': round(float(np.percentile(timings, 95)) * 1000, 4),
+        'p99_ms': round(float(np.percentile(timings, 99)) * 1000, 4),
+        'mean_ms': round(float(timings.mean()) * 1000, 4),
+        'rows_per_second': round(batch_size / float(timings.mean()), 1),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark each stage of the prediction pipeline and emit the results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-sizes', default='1,10,100,1000,10000',
+                            help='Comma separated batch sizes to measure')
+        parser.add_argument('--repeat', type=int, default=50, help='Runs per stage and batch size')
+        parser.add_argument('--max-rows', type=int, default=200000,
+                            help='Cap on rows processed per stage and batch size; fewer runs for large batches')
+        parser.add_argument('--stand-in', action='store_true',
+                            help='Use a randomly fitted stand-in model even if mlp_model.pkl exists')
+        parser.add_argument('--skip-sessions', action='store_true', help='Do not benchmark session writes')
+        parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            batch_sizes = [int(size) for size in options['batch_sizes'].split(',')]
+        except ValueError:
+            raise CommandError(f"Invalid --batch-sizes {options['batch_sizes']!r}")
+
+        artifacts = ModelRegistry().read_manifest()[1]
+        loaded = {}
+        for name in ('encoder', 'scaler'):
+            try:
+                with open(artifacts[name][0], 'rb') as file:
+                    loaded[name] = pickle.load(file)
+            except OSError as e:
+                raise CommandError(f'Cannot read {name} artifact: {str(e)}')
+        encoder, scaler = loaded['encoder'], loaded['scaler']
+
+        model_path = artifacts['model'][0]
+        if options['stand_in'] or not os.path.exists(model_path):
+            model, model_source = stand_in_model(scaler.n_features_in_, options['seed']), 'stand-in'
+        else:
+            with open(model_path, 'rb') as file:
+                model, model_source = pickle.load(file), str(model_path)
+
+        try:
+            bundle = None if model_source == 'stand-in' else registry.get()
+        except ModelUnavailable:
+            bundle = None
+
+        rng = random.Random(options['seed'])
+        categories = dict(zip(encoder.feature_names_in_, encoder.categories_))
+        forms = [
+            {field: str(rng.choice(categories[column])) for column, field, _, _ in FEATURE_FIELDS}
+            for _ in range(max(batch_sizes))
+        ]
+        bodies = [urlencode(form) for form in forms]
+
+        report = {
+            'model': model_source,
+            'serving_engine': bundle.engine if bundle else None,
+            'repeat': options['repeat'],
+            'batch_sizes': {},
+        }
+        for batch_size in batch_sizes:
+            runs = max(3, min(options['repeat'], options['max_rows'] // batch_size))
+            self.stderr.write(f'Batch size {batch_size}: {runs} runs per stage')
+            report['batch_sizes'][str(batch_size)] = self.measure(
+                batch_size, runs, bodies[:batch_size], forms[:batch_size],
+                encoder, scaler, model, bundle, options['skip_sessions']
+            )
+
+        payload = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(payload)
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(payload)
+
+    def measure(self, batch_size, runs, bodies, forms, encoder, scaler, model, bundle, skip_sessions):
+        stages = {
+            'form_parsing': lambda: [build_feature_row(QueryDict(body)) for body in bodies],
+        }
+        rows = stages['form_parsing']()
+        frame = pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+        encoded = encoder.transform(frame)
+        scaled = scaler.transform(encoded)
+
+        stages['dataframe_construction'] = lambda: pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+        stages['encoder_transform'] = lambda: encoder.transform(frame)
+        stages['scaler_transform'] = lambda: scaler.transform(encoded)
+        stages['model_predict'] = lambda: model.predict(scaled)
+        if bundle is not None:
+            # The path the views serve from today, for before/after comparisons
+            stages['serving_predict_rows'] = lambda: bundle.predict_rows(rows)
+
+        results = {stage: summarize(self.time_runs(func, runs), batch_size) for stage, func in stages.items()}
+        if not skip_sessions:
+            results['session_writes'] = self.measure_sessions(forms, runs, batch_size)
+        return results
+
+    def time_runs(self, func, runs):
+        func()  # warm up
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    def measure_sessions(self, forms, runs, batch_size, sample_size=100):
+        """One saved session per form, as the prediction view does for each submission.
+
+        Each save is its own database round trip, so large batches are timed on a
+        sample of ``sample_size`` forms and scaled up to the full batch.
+        """
+        sample = forms[:sample_size]
+        scale = batch_size / len(sample)
+        keys = []
+
+        def write_sessions():
+            for form in sample:
+                session = SessionStore()
+                for key in SESSION_FIELDS:
+                    session[key] = form.get(key, 'Unknown')
+                session.save()
+                keys.append(session.session_key)
+
+        try:
+            timings = self.time_runs(write_sessions, max(3, min(runs, 20)))
+        except DatabaseError as e:
+            self.stderr.write(self.style.WARNING(f'Skipping session writes: {str(e)}'))
+            return None
+        finally:
+            for start in range(0, len(keys), 500):
+                Session.objects.filter(session_key__in=keys[start:start + 500]).delete()
+        return dict(summarize([timing * scale for timing in timings], batch_size), sampled_rows=len(sample))
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from prediction.model_registry import registry
+from prediction.prediction_table import PredictionTable, TableLayout
+
+# Per-process state for pool workers
+_worker = {}
+
+
+def _init_worker(labels_path):
+    django.setup()
+    bundle = registry.get()
+    _worker['bundle'] = bundle
+    _worker['layout'] = TableLayout(bundle.compiled_encoder)
+    _worker['class_index'] = {label: i for i, label in enumerate(bundle.model.classes_)}
+    _worker['labels'] = np.load(labels_path, mmap_mode='r+')
+
+
+def _score_range(start, stop):
+    """Score table entries [start, stop) and write their class codes into the shared file"""
+    bundle = _worker['bundle']
+    encoded = _worker['layout'].encode_range(start, stop, dtype=bundle.encoder.dtype)
+    predictions = bundle.model.predict(bundle.scaler.transform(encoded))
+    class_index = _worker['class_index']
+    labels = _worker['labels']
+    labels[start:stop] = [class_index[label] for label in predictions]
+    labels.flush()
+    return stop - start
+
+
+class Command(BaseCommand):
+    help = 'Score every possible prediction input offline into a memory-mapped lookup table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=50000, help='Entries scored per task')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+        parser.add_argument('--max-entries', type=int, default=50_000_000,
+                            help='Refuse to build tables larger than this')
+        parser.add_argument('--output', help='Table path (defaults to PREDICTION_TABLE_PATH)')
+
+    def handle(self, *args, **options):
+        bundle = registry.get()
+        if not bundle.compiled_encoder.ignore_unknown:
+            raise CommandError("The encoder rejects unknown categories; a lookup table cannot cover them")
+
+        layout = TableLayout(bundle.compiled_encoder)
+        if layout.size > options['max_entries']:
+            raise CommandError(
+                f"Input space has {layout.size} combinations (radices {layout.radices}), "
+                f"above --max-entries={options['max_entries']}"
+            )
+
+        classes = [str(label) for label in bundle.model.classes_]
+        dtype = np.uint8 if len(classes) <= np.iinfo(np.uint8).max else np.uint16
+
+        output = options['output'] or settings.PREDICTION_TABLE_PATH
+        temp_path = output + '.tmp.npy'
+        np.lib.format.open_memmap(temp_path, mode='w+', dtype=dtype, shape=(layout.size,)).flush()
+
+        self.stdout.write(
+            f'Scoring {layout.size} combinations for model {bundle.version} '
+            f'with {options["workers"]} workers...'
+        )
+        started = time.perf_counter()
+        chunk_size = options['chunk_size']
+        ranges = [(start, min(start + chunk_size, layout.size)) for start in range(0, layout.size, chunk_size)]
+        done = 0
+        try:
+            with ProcessPoolExecutor(
+                max_workers=options['workers'], initializer=_init_worker, initargs=(temp_path,)
+            ) as pool:
+                for scored in pool.map(_score_range, *zip(*ranges)):
+                    done += scored
+                    self.stdout.write(f'  {done}/{layout.size}', ending='\r')
+        except Exception:
+            os.remove(temp_path)
+            raise
+        self.stdout.write('')
+
+        meta = {
+            'version': bundle.version,
+            'classes': classes,
+            'dtype': np.dtype(dtype).name,
+            'layout': layout.describe(),
+        }
+        meta_path = PredictionTable.meta_path(output)
+        with open(meta_path + '.tmp', 'w') as file:
+            json.dump(meta, file)
+        os.replace(temp_path, output)
+        os.replace(meta_path + '.tmp', meta_path)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {output} ({os.path.getsize(output) / 1e6:.1f} MB) in {elapsed:.1f}s '
+            f'({layout.size / elapsed:.0f} rows/s)'
+        ))
@@ -0,0 +1,54 @@
+import random
+import time
+
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from prediction.model_registry import registry
+from prediction.predictor import FEATURE_COLUMNS
+
+
+class Command(BaseCommand):
+    help = 'Compare single-row latency of the compiled feature encoder and the fitted encoder'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=1000, help='Single-row encodes to time')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        bundle = registry.get()
+        loaded_encoder = bundle.encoder
+        compiled_encoder = bundle.compiled_encoder
+        # Parity with the fitted encoder is covered by prediction.tests.CompiledEncoderTests
+        row = self.random_row(random.Random(options['seed']), compiled_encoder)
+
+        self.stdout.write('Timing single-row encodes...')
+        dataframe_ms = self.time_per_call(
+            lambda: loaded_encoder.transform(self.as_dataframe([row])), options['repeat']
+        )
+        compiled_ms = self.time_per_call(lambda: compiled_encoder.transform([row]), options['repeat'])
+        self.stdout.write(f'  DataFrame + loaded_encoder: {dataframe_ms:.4f} ms/row')
+        self.stdout.write(f'  compiled_encoder:           {compiled_ms:.4f} ms/row')
+        self.stdout.write(self.style.SUCCESS(f'Speedup: {dataframe_ms / compiled_ms:.1f}x'))
+
+    def random_row(self, rng, compiled_encoder):
+        """Build a row like build_feature_row does, mixing known and unknown values"""
+        row = []
+        for categories in compiled_encoder.categories:
+            if rng.random() < 0.1:
+                row.append('Unknown')
+            else:
+                row.append(str(rng.choice(categories)))
+        return row
+
+    def as_dataframe(self, rows):
+        """Reproduce the DataFrame the prediction view used to build"""
+        return pd.DataFrame.from_dict(
+            {column: [row[i] for row in rows] for i, column in enumerate(FEATURE_COLUMNS)}
+        ).astype(str)
+
+    def time_per_call(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) * 1000 / repeat
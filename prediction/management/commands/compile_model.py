@@ -0,0 +1,85 @@
+import pickle
+import random
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from prediction.feature_encoding import CompiledEncoder
+from prediction.mlp_engine import CompiledMLP, compile_pipeline, compiled_dir_for
+from prediction.model_registry import ModelRegistry, file_checksum
+
+
+class Command(BaseCommand):
+    help = 'Fold the encoder and scaler into the first MLP layer for gather-and-sum inference'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Verify numerical equivalence and benchmark against the three-stage pipeline')
+        parser.add_argument('--rows', type=int, default=5000, help='Random rows for the equivalence check')
+        parser.add_argument('--repeat', type=int, default=2000, help='Single-row predictions to time')
+
+    def handle(self, *args, **options):
+        artifacts = ModelRegistry().read_manifest()[1]
+        loaded = {}
+        checksums = {}
+        for name in ('model', 'encoder', 'scaler'):
+            path = artifacts[name][0]
+            try:
+                checksums[name] = file_checksum(path)
+                with open(path, 'rb') as file:
+                    loaded[name] = pickle.load(file)
+            except OSError as e:
+                raise CommandError(f'Cannot read {name} artifact {path}: {str(e)}')
+
+        compiled_encoder = CompiledEncoder(loaded['encoder'])
+        directory = compiled_dir_for(artifacts['model'][0])
+        try:
+            compile_pipeline(loaded['model'], compiled_encoder, loaded['scaler'], directory, checksums)
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f'Compiled model written to {directory}; used from the next model load'))
+
+        if options['check']:
+            self.check(loaded, compiled_encoder, CompiledMLP(directory), options)
+
+    def check(self, loaded, compiled_encoder, compiled, options):
+        model, scaler = loaded['model'], loaded['scaler']
+        rng = random.Random(0)
+        rows = [
+            [str(rng.choice(categories)) if rng.random() < 0.9 else 'Unknown' for categories in compiled_encoder.categories]
+            for _ in range(options['rows'])
+        ]
+        # Also cover the raw (non-string) categories the folded lookups must keep
+        rows += [[rng.choice(categories) for categories in compiled_encoder.categories] for _ in range(options['rows'])]
+
+        def three_stage(batch):
+            return scaler.transform(compiled_encoder.transform(batch))
+
+        expected_hidden = three_stage(rows) @ model.coefs_[0] + model.intercepts_[0]
+        actual_hidden = compiled.first_layer(rows)
+        max_error = float(np.max(np.abs(expected_hidden - actual_hidden)))
+        if not np.allclose(expected_hidden, actual_hidden, rtol=1e-9, atol=1e-9):
+            raise CommandError(f'First layer differs from the three-stage pipeline (max error {max_error:.3g})')
+
+        mismatched = int((model.predict(three_stage(rows)) != compiled.predict_rows(rows)).sum())
+        if mismatched:
+            raise CommandError(f'Compiled model disagrees on {mismatched} of {len(rows)} predictions')
+        self.stdout.write(self.style.SUCCESS(
+            f'Equivalent on {len(rows)} rows (max first-layer error {max_error:.3g})'
+        ))
+
+        for label, batch in (('single row', rows[:1]), (f'batch of {options["rows"]}', rows[:options['rows']])):
+            repeat = options['repeat'] if len(batch) == 1 else 10
+            pipeline_ms = self.time_per_call(lambda: model.predict(three_stage(batch)), repeat)
+            compiled_ms = self.time_per_call(lambda: compiled.predict_rows(batch), repeat)
+            self.stdout.write(
+                f'  {label:<16} three-stage {pipeline_ms:.4f} ms, compiled {compiled_ms:.4f} ms '
+                f'({pipeline_ms / compiled_ms:.1f}x)'
+            )
+
+    def time_per_call(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) * 1000 / repeat
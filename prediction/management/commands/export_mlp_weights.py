@@ -0,0 +1,101 @@
+import os
+import pickle
+import subprocess
+import sys
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from prediction.mlp_engine import NumpyMLP, export_mlp, weights_dir_for
+from prediction.model_registry import ModelRegistry, file_checksum
+
+
+# Run in a fresh interpreter so the figure includes everything a worker imports
+RSS_PROBE = """
+import os, sys
+{setup}
+with open('/proc/self/statm') as file:
+    print(int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6)
+"""
+
+# Loads the model set the way a serving worker does, encoder and scaler included
+REGISTRY_WORKER = """
+sys.path.insert(0, sys.argv[1])
+import django
+django.setup()
+from prediction.model_registry import registry
+registry.get()
+"""
+
+
+def worker_rss_mb(numpy_engine):
+    """Resident set size of a fresh worker after loading the registry (Linux only)"""
+    env = dict(os.environ, PREDICTION_NUMPY_ENGINE=str(numpy_engine))
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'jobroleprediction.settings')
+    result = subprocess.run(
+        [sys.executable, '-c', RSS_PROBE.format(setup=REGISTRY_WORKER), str(settings.BASE_DIR)],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip())
+
+
+class Command(BaseCommand):
+    help = 'Export the MLP weights to memory-mappable .npy files for the NumPy inference engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Compare against scikit-learn and benchmark latency and RSS')
+        parser.add_argument('--rows', type=int, default=5000, help='Random rows for the parity check')
+        parser.add_argument('--repeat', type=int, default=2000, help='Single-row predictions to time')
+
+    def handle(self, *args, **options):
+        model_path = ModelRegistry().read_manifest()[1]['model'][0]
+        if not os.path.exists(model_path):
+            raise CommandError(f'No model artifact at {model_path}')
+
+        checksum = file_checksum(model_path)
+        with open(model_path, 'rb') as file:
+            model = pickle.load(file)
+
+        directory = weights_dir_for(model_path)
+        try:
+            export_mlp(model, directory, checksum)
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {len(model.coefs_)} layers to {directory}; used from the next model load'
+        ))
+
+        if options['check']:
+            self.check(model, NumpyMLP(directory), options)
+
+    def check(self, model, engine, options):
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(options['rows'], model.coefs_[0].shape[0]))
+
+        expected = model.predict(X)
+        actual = engine.predict(X)
+        mismatched = int((expected != actual).sum())
+        if mismatched:
+            raise CommandError(f'NumPy engine differs from scikit-learn on {mismatched} of {len(X)} rows')
+        self.stdout.write(self.style.SUCCESS(f'Parity OK on {len(X)} rows'))
+
+        row = X[:1]
+        for label, predictor in (('scikit-learn', model), ('numpy engine', engine)):
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                predictor.predict(row)
+            per_call = (time.perf_counter() - start) * 1000 / options['repeat']
+            self.stdout.write(f'  {label:<13} {per_call:.4f} ms/request')
+
+        # What a fresh worker pays to hold the whole model set, either way
+        for label, numpy_engine in (('unpickled model', False), ('mapped weights', True)):
+            rss = worker_rss_mb(numpy_engine)
+            if rss is None:
+                self.stdout.write(self.style.WARNING(f'  Could not measure RSS for {label}'))
+            else:
+                self.stdout.write(f'  RSS per worker with {label}: {rss:.1f} MB')
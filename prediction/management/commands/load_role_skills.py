@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from prediction.models import JobRoleSkill, Skill
+from prediction.skill_taxonomy import DEFAULT_IMPORTANCE, JOB_SKILLS, taxonomy_token
+
+
+class Command(BaseCommand):
+    help = 'Copy the built-in role skills into JobRoleSkill so they can be edited in the admin'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--category', default='Role requirement', help='Category for newly created skills')
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        skills = {}
+        for skill in Skill.objects.order_by('pk'):
+            skills.setdefault(skill.name, skill)
+        existing = set(JobRoleSkill.objects.values_list('job_role', 'skill__name'))
+
+        created = 0
+        for role, names in JOB_SKILLS.items():
+            for name in names:
+                if (role, name) in existing:
+                    continue
+                if name not in skills:
+                    skills[name] = Skill.objects.create(name=name, category=options['category'])
+                JobRoleSkill.objects.create(job_role=role, skill=skills[name], importance=DEFAULT_IMPORTANCE)
+                existing.add((role, name))
+                created += 1
+
+        # Workers must not rebuild from the rows until they are committed
+        taxonomy_token.replace_on_commit()
+        self.stdout.write(self.style.SUCCESS(
+            f'Added {created} role skills ({len(existing) - created} already present)'
+        ))
@@ -0,0 +1,151 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from prediction.model_registry import ModelUnavailable, registry
+from prediction.predictor import FEATURE_FIELDS
+
+STEPS = ['quiz', 'submit_quiz', 'prediction', 'job']
+CHOICE_PATTERN = re.compile(r'name="question_(\d+)" value="(\d+)"')
+# Used when no model is loaded in this process to draw realistic answers from
+SAMPLE_FORM = {
+    'hackathons': '2', 'coding_skills': '7', 'public_speaking_points': '5',
+    'certifications': 'python', 'workshops': 'web technologies', 'interested_subjects': 'programming',
+    'interested_career_area': 'developer', 'Type_of_company_want_to_settle_in': 'Product based',
+    'management_technical': 'Technical', 'team': 'yes', 'introvert': 'no',
+}
+
+
+def form_sampler():
+    """Return a function producing random prediction form submissions"""
+    try:
+        encoder = registry.get().compiled_encoder
+    except ModelUnavailable:
+        return lambda rng: dict(SAMPLE_FORM)
+    categories = dict(zip(encoder.columns, encoder.categories))
+    fields = [(field, categories[column]) for column, field, _, _ in FEATURE_FIELDS]
+    return lambda rng: {
+        field: str(rng.choice(values)) for field, values in fields if field != 'logical_quotient_rating'
+    }
+
+
+class VirtualUser:
+    """Walks quiz -> submit_quiz -> prediction -> job with its own session cookie"""
+
+    def __init__(self, base_url, sample_form, seed, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.sample_form = sample_form
+        self.rng = random.Random(seed)
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def step(self, name, method, path, results, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.base_url + path, timeout=self.timeout, allow_redirects=False, **kwargs
+            )
+            ok = response.status_code < 400
+        except requests.RequestException:
+            response, ok = None, False
+        results[name].append((time.perf_counter() - started, ok))
+        return response if ok else None
+
+    def post(self, name, path, data, results):
+        data = dict(data, csrfmiddlewaretoken=self.session.cookies.get('csrftoken', ''))
+        return self.step(name, 'POST', path, results, data=data, headers={'Referer': self.base_url + path})
+
+    def run_flow(self, results):
+        quiz = self.step('quiz', 'GET', '/quiz/', results)
+        if quiz is None:
+            return False
+        choices = defaultdict(list)
+        for question_id, choice_id in CHOICE_PATTERN.findall(quiz.text):
+            choices[question_id].append(choice_id)
+        answers = {f'question_{question}': self.rng.choice(ids) for question, ids in choices.items()}
+
+        if self.post('submit_quiz', '/submit/', answers, results) is None:
+            return False
+        if self.post('prediction', '/prediction/', self.sample_form(self.rng), results) is None:
+            return False
+        return self.step('job', 'GET', '/job/', results) is not None
+
+
+def percentiles(samples):
+    latencies = np.array([latency for latency, _ in samples]) * 1000
+    errors = sum(1 for _, ok in samples if not ok)
+    if not len(latencies):
+        return {'requests': 0}
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 1),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 1),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 1),
+        'max_ms': round(float(latencies.max()), 1),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Drive the quiz -> prediction -> job flow against a running server with concurrent virtual users'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server under test')
+        parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users')
+        parser.add_argument('--flows', type=int, default=20, help='Flows each user completes')
+        parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds')
+        parser.add_argument('--output', help='Also write the JSON report here')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            requests.get(options['base_url'], timeout=options['timeout'])
+        except requests.RequestException as e:
+            raise CommandError(f"Server at {options['base_url']} is not reachable: {str(e)}")
+
+        sample_form = form_sampler()
+        # One list per step per user, so threads never append to a shared list
+        per_user = [defaultdict(list) for _ in range(options['users'])]
+        completed = [0] * options['users']
+
+        def run_user(index):
+            user = VirtualUser(options['base_url'], sample_form, options['seed'] + index, options['timeout'])
+            for _ in range(options['flows']):
+                completed[index] += user.run_flow(per_user[index])
+
+        self.stdout.write(f"Running {options['users']} users x {options['flows']} flows against {options['base_url']}...")
+        started = time.perf_counter()
+        threads = [threading.Thread(target=run_user, args=(index,)) for index in range(options['users'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        report = {
+            'users': options['users'],
+            'flows_attempted': options['users'] * options['flows'],
+            'flows_completed': sum(completed),
+            'seconds': round(elapsed, 2),
+            'flows_per_second': round(sum(completed) / elapsed, 2),
+            'steps': {},
+        }
+        for step in STEPS:
+            samples = [sample for results in per_user for sample in results[step]]
+            report['steps'][step] = dict(
+                percentiles(samples), requests_per_second=round(len(samples) / elapsed, 2)
+            )
+
+        payload = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(payload)
+        self.stdout.write(payload)
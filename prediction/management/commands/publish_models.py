@@ -0,0 +1,97 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from prediction.feature_encoding import CompiledEncoder
+from prediction.mlp_engine import compile_pipeline, compiled_dir_for, export_mlp, weights_dir_for
+from prediction.model_registry import (
+    DEFAULT_ARTIFACTS, MANIFEST_NAME, ModelRegistry, ModelUnavailable, file_checksum
+)
+
+
+class Command(BaseCommand):
+    help = 'Publish a new model/encoder/scaler set; running workers pick it up without a restart'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', help='Path to the pickled MLP model')
+        parser.add_argument('--encoder', help='Path to the pickled encoder')
+        parser.add_argument('--scaler', help='Path to the pickled scaler')
+        parser.add_argument('--label', help='Version label (defaults to a timestamp)')
+
+    def handle(self, *args, **options):
+        model_dir = Path(settings.PREDICTION_MODEL_DIR)
+        version = options['label'] or timezone.now().strftime('%Y%m%d%H%M%S')
+        version_dir = model_dir / version
+        if version_dir.exists():
+            raise CommandError(f'Version {version} already exists in {model_dir}')
+
+        # Artifacts not given on the command line are carried over from the current set
+        try:
+            current = ModelRegistry(model_dir).read_manifest()[1]
+        except ModelUnavailable as e:
+            raise CommandError(str(e))
+        sources = {}
+        for name in DEFAULT_ARTIFACTS:
+            source = options[name] or current[name][0]
+            if not Path(source).exists():
+                raise CommandError(f'No {name} artifact found at {source}')
+            sources[name] = Path(source)
+
+        version_dir.mkdir(parents=True)
+        artifacts = {}
+        for name, source in sources.items():
+            target = version_dir / DEFAULT_ARTIFACTS[name]
+            shutil.copy2(source, target)
+            artifacts[name] = {'path': target.name, 'sha256': file_checksum(target)}
+
+        manifest = {
+            'version': version,
+            'published_at': timezone.now().isoformat(),
+            'artifacts': artifacts,
+        }
+        with open(version_dir / MANIFEST_NAME, 'w') as file:
+            json.dump(manifest, file, indent=2)
+
+        # Ship memory-mappable weights and the folded pipeline with the set
+        loaded = {}
+        for name in DEFAULT_ARTIFACTS:
+            with open(version_dir / DEFAULT_ARTIFACTS[name], 'rb') as file:
+                loaded[name] = pickle.load(file)
+        model_path = version_dir / DEFAULT_ARTIFACTS['model']
+        checksums = {name: entry['sha256'] for name, entry in artifacts.items()}
+        try:
+            export_mlp(loaded['model'], weights_dir_for(model_path), checksums['model'])
+            compile_pipeline(
+                loaded['model'], CompiledEncoder(loaded['encoder']), loaded['scaler'],
+                compiled_dir_for(model_path), checksums
+            )
+        except ValueError as e:
+            self.stdout.write(self.style.WARNING(f'Skipping weight export and compilation: {str(e)}'))
+
+        # Make sure the new set actually loads before any worker sees it
+        try:
+            ModelRegistry(version_dir).reload()
+        except ModelUnavailable as e:
+            shutil.rmtree(version_dir)
+            raise CommandError(f'New artifact set failed to load: {str(e)}')
+
+        for entry in artifacts.values():
+            entry['path'] = f"{version}/{entry['path']}"
+
+        # Atomic swap of the manifest the workers poll
+        fd, temp_path = tempfile.mkstemp(dir=model_dir, suffix='.json')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temp_path, model_dir / MANIFEST_NAME)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Published model version {version}; workers reload within '
+            f'{settings.PREDICTION_MODEL_RELOAD_INTERVAL}s'
+        ))
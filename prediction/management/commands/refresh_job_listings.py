@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from prediction.job_feed import JOB_SEARCH_MAPPING, job_refresher
+
+
+class Command(BaseCommand):
+    help = 'Refresh cached Adzuna job listings for every role category'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Refresh listings that are still fresh too')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep refreshing every JOB_LISTINGS_REFRESH_INTERVAL seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            failures = job_refresher.refresh_stale(force=options['force'])
+            for search_term, error in failures.items():
+                self.stdout.write(self.style.WARNING(f"  {search_term}: {error}"))
+            self.stdout.write(self.style.SUCCESS(
+                f'Checked {len(JOB_SEARCH_MAPPING)} role categories in {time.perf_counter() - started:.1f}s '
+                f'({len(failures)} failed)'
+            ))
+            if not options['loop']:
+                return
+            time.sleep(settings.JOB_LISTINGS_REFRESH_INTERVAL)
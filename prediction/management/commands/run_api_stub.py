@@ -0,0 +1,114 @@
+import json
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand
+
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries']
+LOCATIONS = ['Bangalore, Karnataka', 'Pune, Maharashtra', 'Hyderabad, Telangana', 'Chennai, Tamil Nadu']
+PROVIDERS = ['www.coursera.org', 'www.udemy.com', 'www.youtube.com', 'developer.mozilla.org']
+
+
+def adzuna_results(what, count):
+    """Deterministic job results shaped like the Adzuna search API"""
+    rng = random.Random(what)
+    now = datetime.now(timezone.utc)
+    results = []
+    for i in range(count):
+        salary_min = rng.randrange(300000, 1500000, 50000)
+        results.append({
+            'id': f"{zlib.crc32(what.encode()):010d}{i:04d}",
+            'title': f"{what.split(' OR ')[0]} {i + 1}",
+            'company': {'display_name': rng.choice(COMPANIES)},
+            'location': {'display_name': rng.choice(LOCATIONS)},
+            'description': f"Stub listing {i + 1} for {what}. " * 12,
+            'salary_min': salary_min,
+            'salary_max': salary_min + rng.randrange(100000, 800000, 50000),
+            'redirect_url': f"https://example.com/jobs/{i}",
+            'created': (now - timedelta(hours=rng.randrange(1, 24 * 30))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+    return {'count': count, 'results': results}
+
+
+def google_items(query, count):
+    """Search items shaped like the Google Custom Search API"""
+    skill = query.split(' tutorial')[0]
+    return {'items': [
+        {
+            'title': f"{skill} course {i + 1}",
+            'snippet': f"Learn {skill} step by step.",
+            'link': f"https://{PROVIDERS[i % len(PROVIDERS)]}/{skill.replace(' ', '-').lower()}",
+            'displayLink': PROVIDERS[i % len(PROVIDERS)],
+        }
+        for i in range(count)
+    ]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        options = self.server.options
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        with self.server.lock:
+            self.server.requests += 1
+        delay = max(0.0, random.gauss(options['latency_ms'], options['jitter_ms'])) / 1000
+        time.sleep(delay)
+
+        if random.random() < options['error_rate']:
+            return self.respond(options['error_status'], {'error': 'injected failure'})
+        if '/search/' in url.path:
+            return self.respond(200, adzuna_results(params.get('what', 'IT Professional'), int(params.get('results_per_page', 5))))
+        if url.path.endswith('/customsearch/v1'):
+            return self.respond(200, google_items(params.get('q', ''), int(params.get('num', 3))))
+        return self.respond(404, {'error': f'No stub for {url.path}'})
+
+    def respond(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = 'Serve stand-ins for the Adzuna and Google Custom Search APIs with injectable latency and errors'
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency-ms', type=float, default=100, help='Mean response latency')
+        parser.add_argument('--jitter-ms', type=float, default=30, help='Standard deviation of the latency')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail')
+        parser.add_argument('--error-status', type=int, default=503, help='Status returned for injected failures')
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer((options['host'], options['port']), StubHandler)
+        server.daemon_threads = True
+        server.options = options
+        server.requests = 0
+        server.lock = threading.Lock()
+
+        base = f"http://{options['host']}:{server.server_port}"
+        self.stdout.write(self.style.SUCCESS(f'API stub listening on {base}'))
+        self.stdout.write(f'  ADZUNA_SEARCH_URL={base}/v1/api/jobs/in/search/1')
+        self.stdout.write(f'  GOOGLE_SEARCH_URL={base}/customsearch/v1')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'Served {server.requests} requests')
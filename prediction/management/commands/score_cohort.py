@@ -0,0 +1,103 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from prediction.model_registry import ModelUnavailable, registry
+from prediction.predictor import build_feature_row, predict_batch
+
+OUTPUT_COLUMNS = ['predicted_role', 'suggested_roles', 'error']
+
+# Per-process state for pool workers
+_worker = {}
+
+
+def _init_worker():
+    django.setup()
+    # Load the model once per worker rather than once per chunk
+    _worker['bundle'] = registry.get()
+
+
+def _score_chunk(records):
+    """Score one chunk of CSV records, returning (role, suggested roles, error) per record"""
+    rows = []
+    positions = []
+    results = [('', '', '')] * len(records)
+    for position, record in enumerate(records):
+        # Blank cells fall back to the form defaults, as a missing POST field would
+        present = {field: value for field, value in record.items() if value != ''}
+        try:
+            rows.append(build_feature_row(present))
+            positions.append(position)
+        except ValueError as e:
+            results[position] = ('', '', str(e))
+
+    for position, scored in zip(positions, predict_batch(rows, bundle=_worker['bundle'])):
+        results[position] = (scored['role'], '; '.join(scored['suggested_roles']), '')
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Score a CSV export of student records and write predicted roles to another CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='CSV with one student per row, using the prediction form field names')
+        parser.add_argument('output', help='CSV to write; the input columns plus ' + ', '.join(OUTPUT_COLUMNS))
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows read and scored per task')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes')
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['input']):
+            raise CommandError(f"No such file: {options['input']}")
+        try:
+            version = registry.get().version
+        except ModelUnavailable as e:
+            raise CommandError(str(e))
+
+        workers = max(1, options['workers'])
+        self.stdout.write(f"Scoring {options['input']} with model {version} and {workers} workers...")
+
+        started = time.perf_counter()
+        scored = errors = 0
+        # Bound the chunks in flight so memory stays flat however large the input is
+        pending = deque()
+        reader = pd.read_csv(
+            options['input'], chunksize=options['chunk_size'], dtype=str, keep_default_na=False
+        )
+        temp_path = options['output'] + '.tmp'
+        try:
+            with open(temp_path, 'w', newline='') as output, ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker
+            ) as pool:
+                for chunk in reader:
+                    pending.append((chunk, pool.submit(_score_chunk, chunk.to_dict('records'))))
+                    if len(pending) >= workers * 2:
+                        scored, errors = self.write_chunk(output, *pending.popleft(), scored, errors)
+                while pending:
+                    scored, errors = self.write_chunk(output, *pending.popleft(), scored, errors)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        os.replace(temp_path, options['output'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {scored} rows to {options['output']} in {elapsed:.1f}s "
+            f"({scored / elapsed:.0f} rows/s, {errors} rows with errors)"
+        ))
+
+    def write_chunk(self, output, chunk, future, scored, errors):
+        results = future.result()
+        for column, values in zip(OUTPUT_COLUMNS, zip(*results)):
+            chunk[column] = values
+        chunk.to_csv(output, header=scored == 0, index=False)
+        scored += len(chunk)
+        errors += sum(1 for result in results if result[2])
+        self.stdout.write(f'  {scored} rows', ending='\r')
+        return scored, errors
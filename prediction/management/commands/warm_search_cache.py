@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from prediction.search_cache import cached_search, store_search
+from prediction.skill_analyzer import SkillGapAnalyzer
+
+
+class Command(BaseCommand):
+    help = 'Prefill the Google search cache with learning resources for every skill in the taxonomy'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Re-fetch skills that are already cached')
+        parser.add_argument('--limit', type=int, default=3, help='Results to store per skill')
+        parser.add_argument('--delay', type=float, default=0.2, help='Seconds to wait between Google calls')
+
+    def handle(self, *args, **options):
+        analyzer = SkillGapAnalyzer()
+        if not analyzer.has_search_key():
+            raise CommandError('GOOGLE_API_KEY is not configured; nothing would be cached')
+
+        taxonomy = analyzer.taxonomy
+        # Skills with predefined resources never reach Google
+        skills = [skill for skill in taxonomy.normalized if taxonomy.resources_for(skill, 1) is None]
+        fetched = skipped = 0
+        failures = {}
+        for skill in skills:
+            query = analyzer.search_query(skill)
+            if not options['force'] and cached_search(query, options['limit']) is not None:
+                skipped += 1
+                continue
+            try:
+                store_search(query, analyzer.google_resources(skill, options['limit']), options['limit'])
+                fetched += 1
+            except Exception as e:
+                failures[skill] = str(e)
+            time.sleep(options['delay'])
+
+        for skill, error in failures.items():
+            self.stdout.write(self.style.WARNING(f"  {skill}: {error}"))
+        self.stdout.write(self.style.SUCCESS(
+            f'Fetched {fetched} of {len(skills)} skills ({skipped} already cached, {len(failures)} failed)'
+        ))
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prediction', '0005_skill_userskillgapanalysis_learningresource_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobListing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('adzuna_id', models.CharField(max_length=64, unique=True)),
+                ('role_category', models.CharField(max_length=100)),
+                ('title', models.CharField(max_length=255)),
+                ('company', models.CharField(blank=True, max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('salary_min', models.FloatField(blank=True, null=True)),
+                ('salary_max', models.FloatField(blank=True, null=True)),
+                ('url', models.URLField(max_length=1000)),
+                ('posted_at', models.DateTimeField()),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+                ('search_text', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['-posted_at', '-id'],
+                'indexes': [
+                    models.Index(fields=['role_category', '-posted_at', '-id'], name='joblisting_role_posted_idx'),
+                    models.Index(fields=['-posted_at', '-id'], name='joblisting_posted_idx'),
+                    models.Index(fields=['location'], name='joblisting_location_idx'),
+                ],
+            },
+        ),
+    ]
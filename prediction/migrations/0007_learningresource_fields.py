@@ -0,0 +1,71 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def is_free_to_is_premium(apps, schema_editor):
+    LearningResource = apps.get_model('prediction', 'LearningResource')
+    LearningResource.objects.filter(is_free=False).update(is_premium=True)
+    LearningResource.objects.filter(provider__isnull=True).update(provider='')
+
+
+def is_premium_to_is_free(apps, schema_editor):
+    LearningResource = apps.get_model('prediction', 'LearningResource')
+    LearningResource.objects.filter(is_premium=True).update(is_free=False)
+
+
+class Migration(migrations.Migration):
+    """Brings LearningResource's table in line with the model, which had moved on without a migration"""
+
+    dependencies = [
+        ('prediction', '0006_joblisting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningresource',
+            name='is_premium',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(is_free_to_is_premium, is_premium_to_is_free),
+        migrations.RemoveField(
+            model_name='learningresource',
+            name='is_free',
+        ),
+        migrations.AddField(
+            model_name='learningresource',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='learningresource',
+            name='difficulty',
+            field=models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], default='beginner', max_length=20),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='learningresource',
+            name='duration',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='learningresource',
+            name='points',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='learningresource',
+            name='rating',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='learningresource',
+            name='provider',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='learningresource',
+            name='resource_type',
+            field=models.CharField(choices=[('course', 'Course'), ('tutorial', 'Tutorial'), ('project', 'Project'), ('article', 'Article'), ('video', 'Video'), ('book', 'Book'), ('practice', 'Practice')], max_length=50),
+        ),
+    ]
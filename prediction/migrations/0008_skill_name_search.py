@@ -0,0 +1,73 @@
+from django.db import migrations
+
+# Substring search on Skill.name for resource_search. Postgres gets a trigram
+# GIN index matching the UPPER(...) LIKE that icontains generates; SQLite gets
+# an FTS5 trigram table kept in sync by triggers. A table remake of
+# prediction_skill on SQLite drops the triggers, so re-run this if that happens.
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS prediction_skill_name_trgm ON prediction_skill '
+    'USING gin ((UPPER("name"::text)) gin_trgm_ops)',
+]
+POSTGRES_BACKWARD = ['DROP INDEX IF EXISTS prediction_skill_name_trgm']
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE prediction_skill_fts USING fts5("
+    "name, content='prediction_skill', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER prediction_skill_fts_insert AFTER INSERT ON prediction_skill BEGIN "
+    "INSERT INTO prediction_skill_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER prediction_skill_fts_delete AFTER DELETE ON prediction_skill BEGIN "
+    "INSERT INTO prediction_skill_fts(prediction_skill_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER prediction_skill_fts_update AFTER UPDATE ON prediction_skill BEGIN "
+    "INSERT INTO prediction_skill_fts(prediction_skill_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO prediction_skill_fts(rowid, name) VALUES (new.id, new.name); END",
+    "INSERT INTO prediction_skill_fts(prediction_skill_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS prediction_skill_fts_insert',
+    'DROP TRIGGER IF EXISTS prediction_skill_fts_delete',
+    'DROP TRIGGER IF EXISTS prediction_skill_fts_update',
+    'DROP TABLE IF EXISTS prediction_skill_fts',
+]
+
+
+def sqlite_has_trigram(schema_editor):
+    # The trigram tokenizer needs SQLite 3.34+ built with FTS5
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(name, tokenize='trigram')")
+        except Exception:
+            return False
+        cursor.execute('DROP TABLE temp.trigram_probe')
+    return True
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = POSTGRES_FORWARD
+    elif vendor == 'sqlite' and sqlite_has_trigram(schema_editor):
+        statements = SQLITE_FORWARD
+    else:
+        # Other backends fall back to a plain icontains scan
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prediction', '0007_learningresource_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
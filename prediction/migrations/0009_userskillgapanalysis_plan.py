@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prediction', '0008_skill_name_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userskillgapanalysis',
+            name='learning_plan',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userskillgapanalysis',
+            name='plan_key',
+            field=models.CharField(blank=True, db_index=True, max_length=40),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prediction', '0009_userskillgapanalysis_plan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255, unique=True)),
+                ('num_results', models.PositiveSmallIntegerField()),
+                ('results', models.JSONField(default=list)),
+                ('fetched_at', models.DateTimeField()),
+                ('last_used_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_categories(apps, schema_editor):
+    JobListing = apps.get_model('prediction', 'JobListing')
+    JobListingCategory = apps.get_model('prediction', 'JobListingCategory')
+    JobListingCategory.objects.bulk_create(
+        JobListingCategory(listing_id=pk, role_category=role_category)
+        for pk, role_category in JobListing.objects.values_list('pk', 'role_category').iterator()
+    )
+
+
+def restore_categories(apps, schema_editor):
+    # A listing only keeps one category; take the first it was filed under
+    JobListing = apps.get_model('prediction', 'JobListing')
+    JobListingCategory = apps.get_model('prediction', 'JobListingCategory')
+    for membership in JobListingCategory.objects.order_by('-pk').iterator():
+        JobListing.objects.filter(pk=membership.listing_id).update(role_category=membership.role_category)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prediction', '0010_cachedsearch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobListingCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role_category', models.CharField(max_length=100)),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='categories', to='prediction.joblisting')),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(fields=('role_category', 'listing'), name='joblisting_category_unique'),
+                ],
+            },
+        ),
+        migrations.RunPython(copy_categories, restore_categories),
+        migrations.RemoveIndex(
+            model_name='joblisting',
+            name='joblisting_role_posted_idx',
+        ),
+        # A default lets the column come back on existing rows when this is reversed
+        migrations.AlterField(
+            model_name='joblisting',
+            name='role_category',
+            field=models.CharField(default='', max_length=100),
+        ),
+        migrations.RemoveField(
+            model_name='joblisting',
+            name='role_category',
+        ),
+    ]
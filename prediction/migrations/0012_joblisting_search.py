@@ -0,0 +1,76 @@
+from django.db import migrations
+
+# Word search on JobListing.search_text for job_feed.search_listings, following
+# 0008_skill_name_search. Postgres gets a trigram GIN index matching the LIKE
+# that contains generates; SQLite gets an FTS5 trigram table kept in sync by
+# triggers. A table remake of prediction_joblisting on SQLite drops the
+# triggers, so re-run this if that happens.
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS prediction_joblisting_search_trgm ON prediction_joblisting '
+    'USING gin ("search_text" gin_trgm_ops)',
+]
+POSTGRES_BACKWARD = ['DROP INDEX IF EXISTS prediction_joblisting_search_trgm']
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE prediction_joblisting_fts USING fts5("
+    "search_text, content='prediction_joblisting', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER prediction_joblisting_fts_insert AFTER INSERT ON prediction_joblisting BEGIN "
+    "INSERT INTO prediction_joblisting_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER prediction_joblisting_fts_delete AFTER DELETE ON prediction_joblisting BEGIN "
+    "INSERT INTO prediction_joblisting_fts(prediction_joblisting_fts, rowid, search_text) "
+    "VALUES ('delete', old.id, old.search_text); END",
+    "CREATE TRIGGER prediction_joblisting_fts_update AFTER UPDATE ON prediction_joblisting BEGIN "
+    "INSERT INTO prediction_joblisting_fts(prediction_joblisting_fts, rowid, search_text) "
+    "VALUES ('delete', old.id, old.search_text); "
+    "INSERT INTO prediction_joblisting_fts(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "INSERT INTO prediction_joblisting_fts(prediction_joblisting_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS prediction_joblisting_fts_insert',
+    'DROP TRIGGER IF EXISTS prediction_joblisting_fts_delete',
+    'DROP TRIGGER IF EXISTS prediction_joblisting_fts_update',
+    'DROP TABLE IF EXISTS prediction_joblisting_fts',
+]
+
+
+def sqlite_has_trigram(schema_editor):
+    # The trigram tokenizer needs SQLite 3.34+ built with FTS5
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(search_text, tokenize='trigram')")
+        except Exception:
+            return False
+        cursor.execute('DROP TABLE temp.trigram_probe')
+    return True
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = POSTGRES_FORWARD
+    elif vendor == 'sqlite' and sqlite_has_trigram(schema_editor):
+        statements = SQLITE_FORWARD
+    else:
+        # Other backends fall back to a plain contains scan
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prediction', '0011_joblistingcategory'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
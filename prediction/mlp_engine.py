@@ -0,0 +1,252 @@
+import json
+import os
+
+import numpy as np
+
+WEIGHTS_DIR_NAME = 'mlp_weights'
+META_NAME = 'meta.json'
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _logistic(x):
+    return np.divide(1.0, 1.0 + np.exp(-x, out=x), out=x)
+
+
+HIDDEN_ACTIVATIONS = {
+    'identity': lambda x: x,
+    'relu': _relu,
+    'tanh': lambda x: np.tanh(x, out=x),
+    'logistic': _logistic,
+}
+
+
+def output_probabilities(scores, out_activation):
+    """Class probabilities from last-layer scores, as MLPClassifier.predict_proba returns them"""
+    if out_activation == 'logistic':
+        positive = _logistic(scores[:, 0].copy())
+        return np.column_stack([1 - positive, positive])
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    scores /= scores.sum(axis=1, keepdims=True)
+    return scores
+
+
+def weights_dir_for(model_path):
+    """Exported weights live next to the pickle they were exported from"""
+    return os.path.join(os.path.dirname(model_path), WEIGHTS_DIR_NAME)
+
+
+def check_supported(model):
+    """Raise ValueError unless the model is a single-output MLPClassifier we can run"""
+    if not hasattr(model, 'coefs_'):
+        raise ValueError(f"{type(model).__name__} is not a fitted MLP")
+    if model.activation not in HIDDEN_ACTIVATIONS:
+        raise ValueError(f"Unsupported hidden activation {model.activation!r}")
+    multilabel = model.out_activation_ == 'logistic' and model.n_outputs_ != 1
+    if model.out_activation_ not in ('softmax', 'logistic') or multilabel:
+        raise ValueError(f"Unsupported output activation {model.out_activation_!r}")
+
+
+def export_mlp(model, directory, model_sha256):
+    """Write a fitted MLPClassifier's layers as raw .npy arrays plus a JSON header"""
+    check_supported(model)
+
+    os.makedirs(directory, exist_ok=True)
+    for i, (coef, intercept) in enumerate(zip(model.coefs_, model.intercepts_)):
+        np.save(os.path.join(directory, f'coef_{i}.npy'), np.ascontiguousarray(coef))
+        np.save(os.path.join(directory, f'intercept_{i}.npy'), np.ascontiguousarray(intercept))
+
+    meta = {
+        'activation': model.activation,
+        'out_activation': model.out_activation_,
+        'n_layers': len(model.coefs_),
+        'classes': [c.item() if isinstance(c, np.generic) else c for c in model.classes_],
+        'model_sha256': model_sha256,
+    }
+    with open(os.path.join(directory, META_NAME), 'w') as file:
+        json.dump(meta, file, indent=2)
+    return meta
+
+
+def read_meta(directory):
+    """Return the export header, or None when nothing was exported there"""
+    try:
+        with open(os.path.join(directory, META_NAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+class NumpyMLP:
+    """Forward pass of an exported MLPClassifier over memory-mapped weights.
+
+    The arrays are opened with mmap_mode='r', so every worker on a host shares
+    the same physical pages instead of holding its own unpickled copy, and
+    serving does not need scikit-learn's estimator machinery.
+    """
+
+    def __init__(self, directory, meta=None):
+        meta = meta or read_meta(directory)
+        if meta is None:
+            raise ValueError(f"No exported MLP weights in {directory}")
+        self.directory = directory
+        self.activation = HIDDEN_ACTIVATIONS[meta['activation']]
+        self.out_activation = meta['out_activation']
+        self.classes_ = np.array(meta['classes'])
+        self.coefs = [
+            np.load(os.path.join(directory, f'coef_{i}.npy'), mmap_mode='r')
+            for i in range(meta['n_layers'])
+        ]
+        self.intercepts = [
+            np.load(os.path.join(directory, f'intercept_{i}.npy'), mmap_mode='r')
+            for i in range(meta['n_layers'])
+        ]
+
+    def decision_function(self, X):
+        """Return the last layer's pre-activation output"""
+        activations = np.asarray(X, dtype=self.coefs[0].dtype)
+        last = len(self.coefs) - 1
+        for i, (coef, intercept) in enumerate(zip(self.coefs, self.intercepts)):
+            activations = activations @ coef
+            activations += intercept
+            if i != last:
+                activations = self.activation(activations)
+        return activations
+
+    def predict_proba(self, X):
+        return output_probabilities(self.decision_function(X), self.out_activation)
+
+    def predict(self, X):
+        scores = self.decision_function(X)
+        if self.out_activation == 'logistic':
+            # Binary case: logistic(z) > 0.5 exactly when z > 0
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        # softmax is monotonic, so the arg max of the raw scores is the prediction
+        return self.classes_[np.argmax(scores, axis=1)]
+
+
+COMPILED_DIR_NAME = 'compiled_model'
+
+
+def compiled_dir_for(model_path):
+    """The compiled model lives next to the pickle it was compiled from"""
+    return os.path.join(os.path.dirname(model_path), COMPILED_DIR_NAME)
+
+
+def compile_pipeline(model, compiled_encoder, scaler, directory, checksums):
+    """Fold one-hot encoding, scaling and the first dense layer into an embedding table.
+
+    For a one-hot row x, ((x - mean) / scale) @ W + b equals the sum of the rows
+    of W / scale selected by x, plus b - (mean / scale) @ W. The folded first
+    layer is stored with one extra all-zero row that unknown categories point at,
+    so inference is a gather, a sum and the remaining layers.
+    """
+    check_supported(model)
+
+    n_features = compiled_encoder.n_features
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.with_std and scaler.scale_ is not None else np.ones(n_features)
+
+    first = model.coefs_[0]
+    embedding = np.zeros((n_features + 1, first.shape[1]), dtype=first.dtype)
+    embedding[:n_features] = first / scale[:, None]
+    bias = model.intercepts_[0] - (mean / scale) @ first
+
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, 'embedding.npy'), embedding)
+    np.save(os.path.join(directory, 'bias.npy'), bias)
+    for i in range(1, len(model.coefs_)):
+        np.save(os.path.join(directory, f'coef_{i}.npy'), np.ascontiguousarray(model.coefs_[i]))
+        np.save(os.path.join(directory, f'intercept_{i}.npy'), np.ascontiguousarray(model.intercepts_[i]))
+
+    meta = {
+        'activation': model.activation,
+        'out_activation': model.out_activation_,
+        'n_layers': len(model.coefs_),
+        'classes': [c.item() if isinstance(c, np.generic) else c for c in model.classes_],
+        'ignore_unknown': compiled_encoder.ignore_unknown,
+        'columns': compiled_encoder.columns,
+        # JSON object keys are always strings, so keep (category, row) pairs
+        'lookups': [
+            [[category, n_features if index is None else index] for category, index in lookup.items()]
+            for lookup in compiled_encoder.lookups
+        ],
+        'checksums': checksums,
+    }
+    with open(os.path.join(directory, META_NAME), 'w') as file:
+        json.dump(meta, file, indent=2)
+    return meta
+
+
+class CompiledMLP:
+    """Inference over a compiled pipeline: embedding gather, sum, remaining layers"""
+
+    def __init__(self, directory, meta=None):
+        meta = meta or read_meta(directory)
+        if meta is None:
+            raise ValueError(f"No compiled model in {directory}")
+        self.directory = directory
+        self.activation = HIDDEN_ACTIVATIONS[meta['activation']]
+        self.out_activation = meta['out_activation']
+        self.classes_ = np.array(meta['classes'])
+        self.ignore_unknown = meta['ignore_unknown']
+        self.columns = meta['columns']
+        self.lookups = [{category: index for category, index in pairs} for pairs in meta['lookups']]
+        self.embedding = np.load(os.path.join(directory, 'embedding.npy'), mmap_mode='r')
+        self.unknown_row = self.embedding.shape[0] - 1
+        self.bias = np.load(os.path.join(directory, 'bias.npy'), mmap_mode='r')
+        self.coefs = [
+            np.load(os.path.join(directory, f'coef_{i}.npy'), mmap_mode='r')
+            for i in range(1, meta['n_layers'])
+        ]
+        self.intercepts = [
+            np.load(os.path.join(directory, f'intercept_{i}.npy'), mmap_mode='r')
+            for i in range(1, meta['n_layers'])
+        ]
+
+    def gather_indices(self, rows):
+        """(n_rows, n_columns) embedding rows to sum; unknowns point at the zero row"""
+        lookups = self.lookups
+        indices = np.array(
+            [lookup.get(value, -1) for row in rows for lookup, value in zip(lookups, row)],
+            dtype=np.intp
+        ).reshape(len(rows), len(lookups))
+        unknown = indices < 0
+        if unknown.any():
+            if not self.ignore_unknown:
+                position, column = np.argwhere(unknown)[0]
+                value = rows[position][column]
+                raise ValueError(f"Found unknown category {value!r} in column '{self.columns[column]}'")
+            indices[unknown] = self.unknown_row
+        return indices
+
+    def first_layer(self, rows):
+        """Pre-activation output of the first hidden layer"""
+        indices = self.gather_indices(rows)
+        if len(rows) <= 64:
+            return self.embedding[indices].sum(axis=1) + self.bias
+        # Column by column keeps large batches from materializing an (n, columns, hidden) array
+        activations = np.repeat(self.bias[np.newaxis, :], len(rows), axis=0)
+        for column_indices in indices.T:
+            activations += self.embedding[column_indices]
+        return activations
+
+    def decision_function(self, rows):
+        activations = self.first_layer(rows)
+        for coef, intercept in zip(self.coefs, self.intercepts):
+            activations = self.activation(activations)
+            activations = activations @ coef
+            activations += intercept
+        return activations
+
+    def predict_proba(self, rows):
+        return output_probabilities(self.decision_function(rows), self.out_activation)
+
+    def predict_rows(self, rows):
+        scores = self.decision_function(rows)
+        if self.out_activation == 'logistic':
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[np.argmax(scores, axis=1)]
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .feature_encoding import CompiledEncoder
+from .mlp_engine import CompiledMLP, NumpyMLP, compiled_dir_for, read_meta, weights_dir_for
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+
+# Artifact name -> file used when the model directory has no manifest
+DEFAULT_ARTIFACTS = {
+    'model': 'mlp_model.pkl',
+    'encoder': 'encoder.pkl',
+    'scaler': 'scaler.pkl',
+}
+
+
+class ModelUnavailable(Exception):
+    """Raised when the prediction artifacts cannot be loaded"""
+
+
+class ModelBundle:
+    """An immutable, fully loaded set of model, encoder and scaler"""
+
+    def __init__(self, model, encoder, scaler, version, checksums, load_seconds, model_dir,
+                 compiled_model=None):
+        self.model = model
+        self.encoder = encoder
+        self.scaler = scaler
+        self.compiled_encoder = CompiledEncoder(encoder)
+        self.compiled_model = compiled_model
+        self.version = version
+        self.checksums = checksums
+        self.load_seconds = load_seconds
+        self.loaded_at = timezone.now()
+        self.model_dir = model_dir
+        if compiled_model is not None:
+            self.engine = 'compiled'
+        else:
+            self.engine = 'numpy' if isinstance(model, NumpyMLP) else 'sklearn'
+
+    def predict_rows(self, rows):
+        """Predict labels for feature rows built by predictor.build_feature_row"""
+        if self.compiled_model is not None:
+            return self.compiled_model.predict_rows(rows)
+        encoded = self.compiled_encoder.transform(rows)
+        return self.model.predict(self.scaler.transform(encoded))
+
+    def describe(self):
+        return {
+            'version': self.version,
+            'engine': self.engine,
+            'checksums': self.checksums,
+            'loaded_at': self.loaded_at.isoformat(),
+            'load_seconds': round(self.load_seconds, 4),
+            'model_dir': str(self.model_dir),
+        }
+
+
+def file_checksum(path):
+    """Return the sha256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """Loads prediction artifacts lazily and swaps in new versions without a restart.
+
+    Nothing is unpickled until the first call to ``get()``. Afterwards the
+    manifest in the model directory is polled every
+    PREDICTION_MODEL_RELOAD_INTERVAL seconds; when it changes (see the
+    ``publish_models`` command) the new artifact set is loaded next to the old
+    one and swapped in with a single reference assignment, so in-flight requests
+    finish on the bundle they started with.
+    """
+
+    def __init__(self, model_dir=None):
+        self._model_dir = Path(model_dir) if model_dir else None
+        self._bundle = None
+        self._manifest_stamp = None
+        self._next_check = 0
+        self._load_lock = threading.Lock()
+
+    @property
+    def model_dir(self):
+        return self._model_dir or Path(settings.PREDICTION_MODEL_DIR)
+
+    def get(self):
+        """Return the current bundle, loading or hot-reloading it if needed"""
+        bundle = self._bundle
+        if bundle is None:
+            with self._load_lock:
+                if self._bundle is None:
+                    self._swap(self._load())
+                return self._bundle
+
+        if time.monotonic() >= self._next_check and self._load_lock.acquire(blocking=False):
+            # Only one thread checks for a new version; the rest keep serving
+            try:
+                self._next_check = time.monotonic() + settings.PREDICTION_MODEL_RELOAD_INTERVAL
+                if self._read_manifest_stamp() != self._manifest_stamp:
+                    self._swap(self._load())
+            except ModelUnavailable as e:
+                logger.error(f"Keeping model version {bundle.version}, reload failed: {str(e)}")
+            finally:
+                self._load_lock.release()
+        return self._bundle
+
+    def reload(self):
+        """Load the artifact set described by the manifest and swap it in"""
+        with self._load_lock:
+            self._swap(self._load())
+            return self._bundle
+
+    def status(self):
+        bundle = self._bundle
+        if bundle is None:
+            return {'loaded': False, 'model_dir': str(self.model_dir)}
+        return dict(bundle.describe(), loaded=True)
+
+    def _swap(self, loaded):
+        bundle, stamp = loaded
+        previous = self._bundle
+        self._bundle = bundle
+        self._manifest_stamp = stamp
+        self._next_check = time.monotonic() + settings.PREDICTION_MODEL_RELOAD_INTERVAL
+        if previous is not None and previous.version != bundle.version:
+            logger.info(f"Prediction model reloaded: {previous.version} -> {bundle.version}")
+
+    def _read_manifest_stamp(self):
+        try:
+            stat = os.stat(self.model_dir / MANIFEST_NAME)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read_manifest(self):
+        """Return (version, {name: (path, expected sha256 or None)})"""
+        manifest_path = self.model_dir / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None, {
+                name: (self.model_dir / filename, None)
+                for name, filename in DEFAULT_ARTIFACTS.items()
+            }
+
+        try:
+            with open(manifest_path) as file:
+                manifest = json.load(file)
+            artifacts = {
+                name: (self.model_dir / entry['path'], entry.get('sha256'))
+                for name, entry in manifest['artifacts'].items()
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            raise ModelUnavailable(f"Invalid model manifest {manifest_path}: {str(e)}")
+        return manifest.get('version'), artifacts
+
+    def _load(self):
+        started = time.perf_counter()
+        stamp = self._read_manifest_stamp()
+        version, artifacts = self.read_manifest()
+
+        missing = [name for name in DEFAULT_ARTIFACTS if name not in artifacts]
+        if missing:
+            raise ModelUnavailable(f"Model manifest is missing artifacts: {', '.join(missing)}")
+
+        loaded = {}
+        checksums = {}
+        for name in DEFAULT_ARTIFACTS:
+            path, expected = artifacts[name]
+            try:
+                with open(path, 'rb') as file:
+                    payload = file.read()
+            except OSError as e:
+                raise ModelUnavailable(f"Cannot read {name} artifact {path}: {str(e)}")
+
+            checksum = hashlib.sha256(payload).hexdigest()
+            if expected and checksum != expected:
+                raise ModelUnavailable(f"Checksum mismatch for {name} artifact {path}")
+            checksums[name] = checksum
+
+            if name == 'model' and settings.PREDICTION_NUMPY_ENGINE:
+                # Prefer weights exported from exactly this pickle (see export_mlp_weights)
+                weights_dir = weights_dir_for(path)
+                meta = read_meta(weights_dir)
+                if meta and meta.get('model_sha256') == checksum:
+                    loaded[name] = NumpyMLP(weights_dir, meta)
+                    continue
+
+            try:
+                loaded[name] = pickle.loads(payload)
+            except Exception as e:
+                raise ModelUnavailable(f"Cannot unpickle {name} artifact {path}: {str(e)}")
+
+        compiled_model = None
+        if settings.PREDICTION_COMPILED_MODEL:
+            # Use the folded pipeline only if it was compiled from these exact artifacts
+            compiled_dir = compiled_dir_for(artifacts['model'][0])
+            meta = read_meta(compiled_dir)
+            if meta and meta.get('checksums') == checksums:
+                compiled_model = CompiledMLP(compiled_dir, meta)
+
+        if not version:
+            combined = ''.join(checksums[name] for name in sorted(checksums))
+            version = hashlib.sha256(combined.encode()).hexdigest()[:12]
+
+        bundle = ModelBundle(
+            model=loaded['model'],
+            encoder=loaded['encoder'],
+            scaler=loaded['scaler'],
+            version=version,
+            checksums=checksums,
+            load_seconds=time.perf_counter() - started,
+            model_dir=self.model_dir,
+            compiled_model=compiled_model,
+        )
+        return bundle, stamp
+
+
+registry = ModelRegistry()
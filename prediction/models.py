@@ -337,7 +337,65 @@ class UserSkillGapAnalysis(models.Model):
     current_skills = models.TextField()  # Store as JSON
     required_skills = models.TextField()  # Store as JSON
     skill_gaps = models.TextField()  # Store as JSON
+    # Content address of the inputs and resource version (see learning_plans.plan_key)
+    plan_key = models.CharField(max_length=40, blank=True, db_index=True)
+    learning_plan = models.JSONField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
     def __str__(self):
-        return f"Analysis for {self.job_role} - {self.created_at}"
\ No newline at end of file
+        return f"Analysis for {self.job_role} - {self.created_at}"
+
+class JobListing(models.Model):
+    """An Adzuna job posting persisted by job_feed.py, so browsing and search stay local"""
+    adzuna_id = models.CharField(max_length=64, unique=True)
+    title = models.CharField(max_length=255)
+    company = models.CharField(max_length=255, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    description = models.TextField(blank=True)
+    salary_min = models.FloatField(null=True, blank=True)
+    salary_max = models.FloatField(null=True, blank=True)
+    url = models.URLField(max_length=1000)
+    posted_at = models.DateTimeField()
+    fetched_at = models.DateTimeField(auto_now=True)
+    search_text = models.TextField(blank=True)  # Lower-cased title, company, location and description
+
+    class Meta:
+        ordering = ['-posted_at', '-id']
+        indexes = [
+            models.Index(fields=['-posted_at', '-id'], name='joblisting_posted_idx'),
+            models.Index(fields=['location'], name='joblisting_location_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.search_text = self.build_search_text()
+        super().save(*args, **kwargs)
+
+    def build_search_text(self):
+        return ' '.join([self.title, self.company, self.location, self.description]).lower()
+
+    def __str__(self):
+        return f"{self.title} at {self.company}"
+
+class JobListingCategory(models.Model):
+    """A predicted role category a JobListing was fetched for; one posting can turn up under several"""
+    listing = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name='categories')
+    role_category = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['role_category', 'listing'], name='joblisting_category_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.listing_id} in {self.role_category}"
+
+class CachedSearch(models.Model):
+    """A Google Custom Search result kept across restarts (see search_cache.py)"""
+    query = models.CharField(max_length=255, unique=True)  # Normalized query string
+    num_results = models.PositiveSmallIntegerField()  # How many results were requested
+    results = models.JSONField(default=list)  # Resource dicts as the learning plan shows them
+    fetched_at = models.DateTimeField()
+    last_used_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.query
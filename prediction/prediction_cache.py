@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+class LocalLRUCache:
+    """A small thread-safe LRU with per-entry expiry, kept in process memory"""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class PredictionCache:
+    """Two-level cache of model outputs keyed on model version and feature row.
+
+    The in-process LRU answers repeat submissions without any I/O; the
+    ``predictions`` Django cache shares results between gunicorn workers.
+    Hit/miss counters are plain in-process integers, so counting never touches
+    the shared cache; ``stats()`` reports the worker that serves the request.
+    """
+
+    def __init__(self):
+        self._local = None
+        self._counters = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def local(self):
+        if self._local is None:
+            self._local = LocalLRUCache(
+                settings.PREDICTION_CACHE_LOCAL_SIZE, settings.PREDICTION_CACHE_TTL
+            )
+        return self._local
+
+    @property
+    def shared(self):
+        return caches[settings.PREDICTION_CACHE_ALIAS]
+
+    def make_key(self, version, row):
+        digest = hashlib.sha1('\x1f'.join(row).encode('utf-8')).hexdigest()
+        return f'prediction:{version}:{digest}'
+
+    def get(self, version, row):
+        key = self.make_key(version, row)
+        value = self.local.get(key)
+        if value is not None:
+            self._count('local_hits')
+            return value
+
+        value = self.shared.get(key)
+        if value is not None:
+            self.local.set(key, value)
+            self._count('shared_hits')
+            return value
+
+        self._count('misses')
+        return None
+
+    def set(self, version, row, value):
+        key = self.make_key(version, row)
+        self.local.set(key, value)
+        self.shared.set(key, value, settings.PREDICTION_CACHE_TTL)
+
+    def clear(self):
+        self.local.clear()
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        return dict(counters, local_entries=len(self.local))
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+
+prediction_cache = PredictionCache()
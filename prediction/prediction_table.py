@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_SLOT = 0
+
+
+class TableLayout:
+    """Mixed-radix numbering of every feature row the prediction view can produce.
+
+    ``build_feature_row`` always hands the encoder strings, so each column can
+    only ever match its string categories; every other value lands in the
+    column's "unknown" slot (0), which the encoder maps to all zeros. Slot k > 0
+    is the k-th string category. Integer-category columns therefore have a
+    radix of 1, which keeps the table small enough to enumerate.
+    """
+
+    def __init__(self, compiled_encoder):
+        self.columns = compiled_encoder.columns
+        self.values = [
+            [category for category in categories if isinstance(category, str)]
+            for categories in compiled_encoder.categories
+        ]
+        # Encoded output column for each slot (-1 for unknown or dropped categories)
+        self.offsets = []
+        for lookup, values in zip(compiled_encoder.lookups, self.values):
+            offsets = [-1] + [lookup[value] if lookup[value] is not None else -1 for value in values]
+            self.offsets.append(np.array(offsets, dtype=np.int64))
+        self.n_features = compiled_encoder.n_features
+        self.radices = [len(values) + 1 for values in self.values]
+
+        self.strides = []
+        stride = 1
+        for radix in reversed(self.radices):
+            self.strides.insert(0, stride)
+            stride *= radix
+        self.size = stride
+        self.slots = [
+            {value: slot for slot, value in enumerate(values, start=1)} for values in self.values
+        ]
+
+    def index_of(self, row):
+        index = 0
+        for slots, stride, value in zip(self.slots, self.strides, row):
+            index += slots.get(value, UNKNOWN_SLOT) * stride
+        return index
+
+    def encode_range(self, start, stop, dtype=np.float64):
+        """One-hot encode table entries [start, stop) without building any rows"""
+        indices = np.arange(start, stop, dtype=np.int64)
+        encoded = np.zeros((len(indices), self.n_features), dtype=dtype)
+        positions = np.arange(len(indices))
+        for radix, stride, offsets in zip(self.radices, self.strides, self.offsets):
+            if radix == 1:
+                continue
+            columns = offsets[(indices // stride) % radix]
+            known = columns >= 0
+            encoded[positions[known], columns[known]] = 1
+        return encoded
+
+    def describe(self):
+        return {
+            'columns': self.columns,
+            'values': self.values,
+            'radices': self.radices,
+            'size': self.size,
+        }
+
+
+class PredictionTable:
+    """Serves predictions from the memory-mapped table built by build_prediction_table.
+
+    The .npy file is opened with mmap_mode='r', so every worker on the host reads
+    the same pages from the OS page cache. The table is only used when it was
+    built for the model version the registry currently serves.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._loaded = None
+        self._next_check = 0
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path or settings.PREDICTION_TABLE_PATH
+
+    @staticmethod
+    def meta_path(path):
+        return os.path.splitext(path)[0] + '.json'
+
+    def for_bundle(self, bundle):
+        """Return the loaded table for ``bundle``'s model version, or None"""
+        loaded = self._loaded
+        if loaded is not None and loaded['version'] == bundle.version:
+            return loaded
+
+        if time.monotonic() < self._next_check or not self._lock.acquire(blocking=False):
+            return None
+        try:
+            self._next_check = time.monotonic() + settings.PREDICTION_MODEL_RELOAD_INTERVAL
+            self._loaded = self._load(bundle)
+        finally:
+            self._lock.release()
+        return self._loaded
+
+    def lookup(self, rows, bundle):
+        """Return predicted labels for ``rows`` or None if the table cannot answer"""
+        loaded = self.for_bundle(bundle)
+        if loaded is None:
+            return None
+        layout = loaded['layout']
+        codes = loaded['labels'][[layout.index_of(row) for row in rows]]
+        return loaded['classes'][codes]
+
+    def _load(self, bundle):
+        path = self.path
+        if not os.path.exists(path) or not bundle.compiled_encoder.ignore_unknown:
+            return None
+        try:
+            with open(self.meta_path(path)) as file:
+                meta = json.load(file)
+            labels = np.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot open prediction table {path}: {str(e)}")
+            return None
+
+        layout = TableLayout(bundle.compiled_encoder)
+        if meta['version'] != bundle.version or meta['layout'] != layout.describe() \
+                or labels.shape != (layout.size,):
+            logger.warning(f"Prediction table {path} was built for model {meta['version']}, ignoring it")
+            return None
+        return {
+            'version': meta['version'],
+            'layout': layout,
+            'labels': labels,
+            'classes': np.array(meta['classes'], dtype=object),
+        }
+
+
+prediction_table = PredictionTable()
@@ -0,0 +1,104 @@
+from django.conf import settings
+
+from .batching import inference_batcher
+from .model_registry import registry
+from .prediction_cache import prediction_cache
+from .prediction_table import prediction_table
+
+
+# Encoder column -> (form field, default value, is numeric)
+FEATURE_FIELDS = [
+    ("Logical quotient rating", 'logical_quotient_rating', None, True),
+    ("hackathons", 'hackathons', "0", True),
+    ("coding skills rating", 'coding_skills', "0", True),
+    ("public speaking points", 'public_speaking_points', "0", True),
+    ("certifications", 'certifications', "Unknown", False),
+    ("workshops", 'workshops', "Unknown", False),
+    ("Interested subjects", 'interested_subjects', "Unknown", False),
+    ("interested career area ", 'interested_career_area', "Unknown", False),
+    ("Type of company want to settle in?", 'Type_of_company_want_to_settle_in', "Unknown", False),
+    ("Management or Technical", 'management_technical', "Unknown", False),
+    ("worked in teams ever?", 'team', "No", False),
+    ("Introvert", 'introvert', "No", False),
+]
+
+FEATURE_COLUMNS = [column for column, _, _, _ in FEATURE_FIELDS]
+
+job_roles = {
+    'CRM/Managerial Roles': ['CRM Business Analyst', 'CRM Technical Developer', 'Project Manager', 'Information Technology Manager'],
+    'Analyst': ['Business Systems Analyst', 'Business Intelligence Analyst', 'E-Commerce Analyst'],
+    'Mobile Applications/ Web Development': ['Mobile Applications Developer', 'Web Developer', 'Applications Developer'],
+    'QA/Testing': ['Software Quality Assurance (QA) / Testing', 'Quality Assurance Associate'],
+    'UX/Design': ['UX Designer', 'Design & UX'],
+    'Databases': ['Database Developer', 'Database Administrator', 'Database Manager', 'Portal Administrator'],
+    'Programming/ Systems Analyst': ['Programmer Analyst', 'Systems Analyst'],
+    'Networks/ Systems': ['Network Security Administrator', 'Network Security Engineer', 'Network Engineer', 'Systems Security Administrator', 'Software Systems Engineer', 'Information Security Analyst'],
+    'SE/SDE': ['Software Engineer', 'Software Developer'],
+    'Technical Support/Service': ['Technical Engineer', 'Technical Services/Help Desk/Tech Support', 'Technical Support'],
+    'others': ['Solutions Architect', 'Data Architect', 'Information Technology Auditor']
+}
+
+
+def build_feature_row(data, score=None):
+    """Turn a form/record mapping into the string row the encoder was fed by the prediction view.
+
+    ``score`` overrides the logical quotient rating (the web flow takes it from the
+    quiz session instead of the form). Raises ValueError for non-integer ratings.
+    """
+    row = []
+    for column, field, default, is_numeric in FEATURE_FIELDS:
+        if field == 'logical_quotient_rating' and score is not None:
+            value = score
+        else:
+            value = data.get(field, default)
+        if is_numeric and value is not None:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{field}' must be an integer, got {value!r}")
+        row.append(str(value))
+    return row
+
+
+def suggested_roles_for(result):
+    """Return the concrete job titles suggested for a predicted role category"""
+    return job_roles.get(result, ['Unknown'])
+
+
+def predict_rows(rows, bundle=None):
+    """Run encoder, scaler and model once over a list of feature rows"""
+    bundle = bundle or registry.get()
+    # The precomputed table answers every row when it matches this model version
+    labels = prediction_table.lookup(rows, bundle)
+    if labels is not None:
+        return labels
+    return bundle.predict_rows(rows)
+
+
+def predict_batch(rows, chunk_size=None, bundle=None):
+    """Score feature rows in vectorized chunks, returning role and suggestions per row"""
+    chunk_size = chunk_size or settings.PREDICTION_BATCH_CHUNK_SIZE
+    # Pin one bundle so a hot reload mid-batch cannot mix model versions
+    bundle = bundle or registry.get()
+    results = []
+    for start in range(0, len(rows), chunk_size):
+        for role in predict_rows(rows[start:start + chunk_size], bundle):
+            role = str(role)
+            results.append({
+                'role': role,
+                'suggested_roles': suggested_roles_for(role),
+            })
+    return results
+
+
+def predict_one(row):
+    """Score a single feature row, reusing cached output for identical submissions"""
+    bundle = registry.get()
+    scored = prediction_cache.get(bundle.version, row)
+    if scored is None:
+        if settings.PREDICTION_MICRO_BATCHING:
+            scored = inference_batcher.predict(row, bundle=bundle)
+        else:
+            scored = predict_batch([row], bundle=bundle)[0]
+        prediction_cache.set(bundle.version, row, scored)
+    return scored
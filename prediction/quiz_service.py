@@ -0,0 +1,126 @@
+import random
+import threading
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from .models import Choice, Question
+from .version_tokens import VersionToken
+
+QUIZ_VERSION_KEY = 'quiz_version'
+quiz_token = VersionToken(QUIZ_VERSION_KEY)
+
+
+def quiz_version():
+    """Token identifying the current question bank; replaced whenever it changes"""
+    return quiz_token.get()
+
+
+def invalidate_quiz():
+    quiz_token.replace()
+
+
+class AnswerKey:
+    """The set of correct (question id, choice id) pairs, loaded with a single query.
+
+    The key is held in process memory under the quiz version token. Saving or
+    deleting a Question or Choice (see signals.py) replaces the token, so every
+    worker reloads once, with that one query, after its next token check.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._pairs = frozenset()
+        self._lock = threading.Lock()
+
+    def correct_pairs(self):
+        version = quiz_version()
+        if version == self._version:
+            return self._pairs
+
+        with self._lock:
+            if version != self._version:
+                # With the database cache, reading a shared copy would cost as much as this query
+                self._pairs = frozenset(Choice.objects.filter(is_correct=True).values_list('question_id', 'pk'))
+                self._version = version
+            return self._pairs
+
+    def score(self, answers):
+        """Count the correct answers in a {question id: choice id} mapping"""
+        return len(set(answers.items()) & self.correct_pairs())
+
+
+answer_key = AnswerKey()
+
+
+class QuestionPool:
+    """Ready-made quiz variants for the current question bank.
+
+    Questions and their choices are loaded in two queries per bank version and
+    kept as plain dicts. QUIZ_VARIANT_COUNT shuffled variants of
+    QUIZ_QUESTIONS_PER_VARIANT questions each (all of them when unset) are drawn
+    up front. Each variant's question list is rendered once and kept in
+    memory with it, so a quiz page runs no queries and no cache reads however
+    large the bank grows.
+    """
+
+    def __init__(self):
+        # (version, variants, {variant number: rendered fragment}), swapped as one
+        self._state = None
+        self._lock = threading.Lock()
+
+    def _current(self, version):
+        state = self._state
+        if state is not None and state[0] == version:
+            return state
+
+        with self._lock:
+            if self._state is None or self._state[0] != version:
+                self._state = (version, self._build_variants(version), {})
+            return self._state
+
+    def variants(self, version=None):
+        return self._current(version or quiz_version())[1]
+
+    def _build_variants(self, version):
+        questions = [
+            {
+                'id': question.pk,
+                'question_text': question.question_text,
+                'choices': [{'id': choice.pk, 'choice_text': choice.choice_text} for choice in question.choice_set.all()],
+            }
+            for question in Question.objects.prefetch_related('choice_set').order_by('pk')
+        ]
+        size = settings.QUIZ_QUESTIONS_PER_VARIANT or len(questions)
+        size = min(size, len(questions))
+        variants = []
+        for number in range(max(1, settings.QUIZ_VARIANT_COUNT)):
+            # Seeded by version so every worker draws the same variants
+            rng = random.Random(f'{version}:{number}')
+            variants.append(rng.sample(questions, size))
+        return variants
+
+    def render(self, number=None):
+        """Return (variant number, rendered question list) for a random or given variant"""
+        _, variants, fragments = self._current(quiz_version())
+        if number is None:
+            number = random.randrange(len(variants))
+        fragment = fragments.get(number)
+        if fragment is None:
+            fragment = fragments[number] = render_to_string('quiz_questions.html', {'questions': variants[number]})
+        return number, fragment
+
+
+question_pool = QuestionPool()
+
+
+def submitted_answers(post):
+    """Read ``question_<id>=<choice id>`` fields from a quiz submission"""
+    answers = {}
+    for field, choice_id in post.items():
+        if field.startswith('question_'):
+            try:
+                answers[int(field[len('question_'):])] = int(choice_id)
+            except ValueError:
+                continue
+    return answers
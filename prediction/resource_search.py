@@ -0,0 +1,98 @@
+import logging
+from collections import defaultdict
+
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import LearningResource
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'prediction_skill_fts'
+# The trigram index can only answer searches of at least this many characters
+MIN_TRIGRAM_LENGTH = 3
+
+_fts_available = {}
+
+
+def fts_available(table=FTS_TABLE):
+    """Whether migration 0008_skill_name_search created the SQLite FTS5 table; checked once per process.
+
+    Pass ``table`` to check for another FTS5 table, such as the job listing one from 0012.
+    """
+    if connection.vendor != 'sqlite':
+        return False
+    if (connection.alias, table) not in _fts_available:
+        _fts_available[connection.alias, table] = table in connection.introspection.table_names(include_views=False)
+    return _fts_available[connection.alias, table]
+
+
+def skill_name_filter(skills):
+    """One Q matching resources whose skill name contains any of ``skills``, case-insensitively.
+
+    On SQLite the long names go through the FTS5 trigram table as a single
+    MATCH; on Postgres the OR'd icontains clauses use the trigram GIN index.
+    """
+    skills = list(dict.fromkeys(skills))
+    if fts_available():
+        indexed = [skill for skill in skills if len(skill) >= MIN_TRIGRAM_LENGTH]
+        plain = [skill for skill in skills if len(skill) < MIN_TRIGRAM_LENGTH]
+    else:
+        indexed, plain = [], skills
+
+    condition = Q()
+    for skill in plain:
+        condition |= Q(skill__name__icontains=skill)
+    if indexed:
+        match = ' OR '.join('"{}"'.format(skill.replace('"', '""')) for skill in indexed)
+        condition |= Q(skill_id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,)))
+    return condition
+
+
+def resource_card(resource):
+    """The dict skill_gap.html renders for a stored LearningResource"""
+    return {
+        'title': resource.title,
+        'description': resource.description,
+        'url': resource.url,
+        'type': resource.resource_type,
+        'is_free': not resource.is_premium,
+        'provider': resource.provider
+    }
+
+
+def rank_key(skill_lower):
+    """Exact skill-name matches first, then the best rated, then the oldest"""
+    def key(resource):
+        rating = resource.rating if resource.rating is not None else -1
+        return (resource.skill.name.lower() != skill_lower, -rating, resource.pk)
+    return key
+
+
+def resolve_resources(skills, limit=3):
+    """Stored resources for every skill in one query: {skill: [card, ...]}.
+
+    Skills with no stored resources are left out. A resource belongs to every
+    skill whose name is a substring of its skill's name, as with icontains.
+    """
+    skills = [skill for skill in skills if skill]
+    if not skills:
+        return {}
+    try:
+        candidates = list(LearningResource.objects.select_related('skill').filter(skill_name_filter(skills)))
+    except DatabaseError as e:
+        logger.error(f"Error fetching resources from database: {str(e)}")
+        return {}
+
+    by_skill = defaultdict(list)
+    for resource in candidates:
+        name = resource.skill.name.lower()
+        for skill in skills:
+            if skill.lower() in name:
+                by_skill[skill].append(resource)
+
+    return {
+        skill: [resource_card(resource) for resource in sorted(matches, key=rank_key(skill.lower()))[:limit]]
+        for skill, matches in by_skill.items()
+    }
@@ -0,0 +1,60 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from .models import CachedSearch
+
+logger = logging.getLogger(__name__)
+
+# Hits refresh last_used_at at most this often, so popular queries don't write on every read
+TOUCH_INTERVAL = timedelta(hours=1)
+
+
+def normalize_query(query):
+    return ' '.join(query.lower().split())[:255]
+
+
+def cached_search(query, limit):
+    """Stored results for ``query`` if they are fresh and cover ``limit`` results, else None"""
+    now = timezone.now()
+    try:
+        entry = CachedSearch.objects.filter(
+            query=normalize_query(query),
+            fetched_at__gte=now - timedelta(seconds=settings.GOOGLE_SEARCH_CACHE_TTL),
+            num_results__gte=limit,
+        ).first()
+        if entry is None:
+            return None
+        if now - entry.last_used_at >= TOUCH_INTERVAL:
+            CachedSearch.objects.filter(pk=entry.pk).update(last_used_at=now)
+    except DatabaseError as e:
+        logger.error(f"Error reading cached search: {str(e)}")
+        return None
+    return entry.results[:limit]
+
+
+def store_search(query, results, limit):
+    """Keep results for ``query``, evicting the least recently used entries past the cap"""
+    now = timezone.now()
+    try:
+        CachedSearch.objects.update_or_create(
+            query=normalize_query(query),
+            defaults={'num_results': limit, 'results': results, 'fetched_at': now, 'last_used_at': now},
+        )
+        evict_searches()
+    except DatabaseError as e:
+        logger.error(f"Error storing cached search: {str(e)}")
+
+
+def evict_searches():
+    """Drop expired entries and trim to GOOGLE_SEARCH_CACHE_MAX_ENTRIES, least recently used first"""
+    expired = timezone.now() - timedelta(seconds=settings.GOOGLE_SEARCH_CACHE_TTL)
+    removed = CachedSearch.objects.filter(fetched_at__lt=expired).delete()[0]
+    excess = CachedSearch.objects.count() - settings.GOOGLE_SEARCH_CACHE_MAX_ENTRIES
+    if excess > 0:
+        oldest = list(CachedSearch.objects.order_by('last_used_at', 'pk').values_list('pk', flat=True)[:excess])
+        removed += CachedSearch.objects.filter(pk__in=oldest).delete()[0]
+    return removed
@@ -2,7 +2,7 @@ from rest_framework import serializers
 from .models import (
     UserProfile, RoadmapStage, UserStageProgress, Badge, UserBadge,
     Achievement, UserAchievement, DailyChallenge, UserChallengeProgress,
-    WeeklyQuest, UserQuestProgress, SkillMastery, ActivityLog
+    WeeklyQuest, UserQuestProgress, SkillMastery, ActivityLog, JobListing
 )
 
 
@@ -272,4 +272,17 @@ class ResourceCompletionSerializer(serializers.Serializer):
 class DailyActivitySerializer(serializers.Serializer):
     """Input for daily activity logging"""
     type = serializers.CharField()
-    activity_details = serializers.DictField(required=False)
\ No newline at end of file
+    activity_details = serializers.DictField(required=False)
+
+class JobListingSerializer(serializers.ModelSerializer):
+    """Serializer for stored Adzuna job listings"""
+    role_categories = serializers.SlugRelatedField(
+        source='categories', slug_field='role_category', many=True, read_only=True
+    )
+
+    class Meta:
+        model = JobListing
+        fields = [
+            'adzuna_id', 'role_categories', 'title', 'company', 'location', 'description',
+            'salary_min', 'salary_max', 'url', 'posted_at'
+        ]
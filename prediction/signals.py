@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .learning_plans import plan_token
+from .models import Choice, JobRoleSkill, LearningResource, Question, Skill
+from .quiz_service import quiz_token
+from .skill_taxonomy import taxonomy_token
+
+
+@receiver([post_save, post_delete], sender=Question)
+@receiver([post_save, post_delete], sender=Choice)
+def invalidate_quiz_cache(sender, **kwargs):
+    """Questions or choices changed (usually through the admin); rebuild the answer key and variants.
+
+    The token is replaced once the change commits, so no worker reloads the old bank under the new token.
+    """
+    quiz_token.replace_on_commit()
+
+
+@receiver([post_save, post_delete], sender=LearningResource)
+@receiver([post_save, post_delete], sender=Skill)
+def invalidate_learning_plan_cache(sender, **kwargs):
+    """Stored resources changed; memoized learning plans may list stale ones.
+
+    Plans are retired once the change commits, so none is rebuilt from the old resources under the new token.
+    """
+    plan_token.replace_on_commit()
+
+
+@receiver([post_save, post_delete], sender=JobRoleSkill)
+@receiver([post_save, post_delete], sender=Skill)
+def invalidate_skill_taxonomy(sender, **kwargs):
+    """Role skills changed; once committed, every worker rebuilds its taxonomy snapshot on its next request"""
+    taxonomy_token.replace_on_commit()
@@ -0,0 +1,112 @@
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class RecentlyFailed(Exception):
+    """Raised instead of calling an upstream that failed within the negative-cache TTL"""
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time, across threads and workers.
+
+    Threads in one process share the leader's Future. Other workers are kept
+    out by a ``cache.add`` lock and pick up the result the leader publishes in
+    the cache. A failure is remembered for ``negative_ttl`` seconds, during
+    which callers get RecentlyFailed without touching the upstream.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _key(self, kind, key):
+        # Search terms have spaces, which memcached rejects and the database cache warns about
+        return f'{self.prefix}:{kind}:{hashlib.sha1(key.encode()).hexdigest()}'
+
+    def recent_failure(self, key):
+        return cache.get(self._key('failed', key))
+
+    def run(self, key, func, negative_ttl):
+        """Return func()'s result, or the result of the call already in flight for ``key``"""
+        failure = self.recent_failure(key)
+        if failure is not None:
+            raise RecentlyFailed(failure)
+
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._run_leader(key, func, negative_ttl)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def _run_leader(self, key, func, negative_ttl):
+        lock_key = self._key('lock', key)
+        result_key = self._key('result', key)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT
+        # Tokens of the other workers' fetches we waited on; only their results are reused
+        awaited = set()
+
+        while not cache.add(lock_key, token, settings.SINGLE_FLIGHT_LOCK_TTL):
+            # Another worker is fetching; reuse its result once it publishes one
+            holder = cache.get(lock_key)
+            if holder is not None:
+                awaited.add(holder)
+            time.sleep(0.05)
+            failure = self.recent_failure(key)
+            if failure is not None:
+                raise RecentlyFailed(failure)
+            published = self._published(result_key, awaited)
+            if published is not None:
+                return published[0]
+            if time.monotonic() >= deadline:
+                raise RecentlyFailed(f"Timed out waiting for another worker to fetch '{key}'")
+
+        try:
+            # The worker we waited on may have released the lock just before we took it
+            published = self._published(result_key, awaited)
+            if published is not None:
+                return published[0]
+            try:
+                result = func()
+            except Exception as e:
+                cache.set(self._key('failed', key), str(e) or type(e).__name__, negative_ttl)
+                raise
+            # Publish before releasing the lock so waiting workers find the result
+            cache.set(result_key, (token, result), settings.SINGLE_FLIGHT_LOCK_TTL)
+            return result
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    def _published(self, result_key, awaited):
+        """(result,) if one of the awaited fetches has published its result, else None"""
+        if not awaited:
+            return None
+        published = cache.get(result_key)
+        if published is not None and published[0] in awaited:
+            return (published[1],)
+        return None
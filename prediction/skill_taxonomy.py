@@ -0,0 +1,308 @@
+import hashlib
+import json
+import logging
+import threading
+from types import MappingProxyType
+
+import numpy as np
+from django.db import DatabaseError
+
+from .models import JobRoleSkill
+from .version_tokens import VersionToken
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_VERSION_KEY = 'skill_taxonomy_version'
+# JobRoleSkill.importance default; every hard-coded role skill counts this much
+DEFAULT_IMPORTANCE = 5
+
+# Role category -> skills the role needs; used for any role without JobRoleSkill rows
+# (see 'manage.py load_role_skills')
+JOB_SKILLS = {
+    'CRM/Managerial Roles': ['Project Management', 'Leadership', 'CRM Software', 'Client Relations', 'Business Analysis', 'Communication', 'Stakeholder Management'],
+    'Analyst': ['Data Analysis', 'SQL', 'Excel', 'Data Visualization', 'Statistical Analysis', 'Problem Solving', 'Business Intelligence'],
+    'Mobile Applications/ Web Development': ['JavaScript', 'HTML/CSS', 'React', 'Mobile Development', 'API Integration', 'UI/UX Principles', 'Git'],
+    'QA/Testing': ['Test Planning', 'Automated Testing', 'Manual Testing', 'Test Documentation', 'Bug Tracking', 'Selenium', 'Quality Assurance'],
+    'UX/Design': ['User Research', 'Wireframing', 'Prototyping', 'Design Systems', 'User Testing', 'Figma', 'Interaction Design'],
+    'Databases': ['SQL', 'Database Management', 'Data Modeling', 'NoSQL', 'Database Security', 'Query Optimization', 'Data Architecture'],
+    'Programming/ Systems Analyst': ['Programming Logic', 'Algorithm Design', 'System Analysis', 'Documentation', 'Business Requirements', 'Troubleshooting'],
+    'Networks/ Systems': ['Network Protocols', 'Security Fundamentals', 'System Administration', 'Cloud Infrastructure', 'Firewalls', 'Monitoring Tools'],
+    'SE/SDE': ['Data Structures', 'Algorithms', 'Object-Oriented Programming', 'Version Control', 'Testing Methodologies', 'Framework Experience', 'API Design'],
+    'Technical Support/Service': ['Troubleshooting', 'Customer Service', 'Technical Documentation', 'Support Tools', 'Ticket Management', 'Hardware Knowledge'],
+    'others': ['Cloud Services', 'Solution Design', 'Architecture Principles', 'IT Governance', 'Compliance', 'Infrastructure Planning']
+}
+
+# Predefined learning resources for common skills
+DEFAULT_RESOURCES = {
+    'SQL': [
+        {'title': 'SQL Basics', 'url': 'https://www.w3schools.com/sql/', 'type': 'Tutorial', 'is_free': True, 'provider': 'W3Schools'},
+        {'title': 'Introduction to SQL', 'url': 'https://www.codecademy.com/learn/learn-sql', 'type': 'Course', 'is_free': True, 'provider': 'Codecademy'},
+        {'title': 'SQL for Data Analysis', 'url': 'https://www.udacity.com/course/sql-for-data-analysis--ud198', 'type': 'Course', 'is_free': True, 'provider': 'Udacity'}
+    ],
+    'Python': [
+        {'title': 'Learn Python', 'url': 'https://www.learnpython.org/', 'type': 'Tutorial', 'is_free': True, 'provider': 'LearnPython.org'},
+        {'title': 'Python for Everybody', 'url': 'https://www.coursera.org/specializations/python', 'type': 'Course', 'is_free': False, 'provider': 'Coursera'},
+        {'title': 'Automate the Boring Stuff with Python', 'url': 'https://automatetheboringstuff.com/', 'type': 'Book', 'is_free': True, 'provider': 'Al Sweigart'}
+    ],
+    # Add more predefined resources for common skills
+}
+
+# Related skills implied by a certification, keyed by the lower-cased form value
+CERTIFICATION_SKILLS = {
+    'python': ['Python', 'Programming'],
+    'machine learning': ['Machine Learning', 'Data Science', 'Python'],
+    'full stack': ['JavaScript', 'HTML/CSS', 'Web Development', 'Backend Development'],
+    'app development': ['Mobile Development', 'UI/UX Principles'],
+    'information security': ['Security Fundamentals', 'Network Security'],
+    'hadoop': ['Big Data', 'Data Processing'],
+    'r programming': ['R', 'Data Analysis', 'Statistics']
+}
+
+# Related skills implied by a workshop, keyed by the lower-cased form value
+WORKSHOP_SKILLS = {
+    'data science': ['Data Analysis', 'Statistics', 'Machine Learning'],
+    'web technologies': ['HTML/CSS', 'JavaScript', 'Web Development'],
+    'cloud computing': ['Cloud Infrastructure', 'Scalability', 'AWS/Azure/GCP'],
+    'game development': ['Game Design', 'Graphics Programming', 'Unity/Unreal'],
+    'hacking': ['Security Fundamentals', 'Penetration Testing', 'Ethical Hacking']
+}
+
+# Other names for a taxonomy skill, keyed by the lower-cased alternative, so a
+# resource lookup by either name finds the skill's predefined resources. Gap
+# matching ignores them: only list true synonyms here.
+SKILL_ALIASES = {
+    'object oriented programming': 'Object-Oriented Programming',
+    'ecmascript': 'JavaScript',
+    'structured query language': 'SQL',
+}
+
+# Joins normalized user skills into one string; skill names never contain it,
+# so a required skill can't match across two user skills
+SKILL_SEPARATOR = '\x00'
+
+
+# Replaced whenever JobRoleSkill or Skill rows change
+taxonomy_token = VersionToken(TAXONOMY_VERSION_KEY)
+
+
+def invalidate_taxonomy():
+    # A fresh token rather than incr(), which the database cache doesn't do atomically
+    taxonomy_token.replace()
+
+
+def stored_role_skills():
+    """{role: [(skill name, importance), ...]} from JobRoleSkill, most important first"""
+    role_skills = {}
+    rows = JobRoleSkill.objects.order_by('job_role', '-importance', 'pk').values_list(
+        'job_role', 'skill__name', 'importance'
+    )
+    for role, skill, importance in rows:
+        role_skills.setdefault(role, []).append((skill, importance))
+    return role_skills
+
+
+def source_data(role_skills=None):
+    """The mappings a taxonomy is compiled from.
+
+    A role with stored skills uses them; every other role keeps its hard-coded
+    skills, so storing one role's rows doesn't drop the rest.
+    """
+    merged = {role: [(skill, DEFAULT_IMPORTANCE) for skill in skills] for role, skills in JOB_SKILLS.items()}
+    merged.update(role_skills or {})
+    return {
+        'role_skills': merged,
+        'default_resources': DEFAULT_RESOURCES,
+        'certification_skills': CERTIFICATION_SKILLS,
+        'workshop_skills': WORKSHOP_SKILLS,
+        'skill_aliases': SKILL_ALIASES,
+    }
+
+
+class SkillTaxonomy:
+    """An immutable, precompiled view of the skill mappings.
+
+    Skill names are lower-cased once here instead of on every request, role
+    skills are tuples, and every table is a read-only mapping so one instance
+    can be shared by all threads. ``version`` is a digest of the source data.
+
+    ``aliases`` maps each lower-cased alternative name to its skill, so
+    resource lookups accept either name; gap matching uses skill names only.
+
+    ``role_matrix`` is a read-only roles x vocabulary matrix of importance
+    weights over every distinct role skill, so one user's fit against all
+    roles, or a whole cohort's, is a single matrix product.
+    """
+
+    def __init__(self, role_skills, default_resources, certification_skills, workshop_skills, skill_aliases):
+        self.version = hashlib.sha1(json.dumps(
+            [role_skills, default_resources, certification_skills, workshop_skills, skill_aliases], sort_keys=True
+        ).encode()).hexdigest()[:12]
+        job_skills = {role: [skill for skill, _ in pairs] for role, pairs in role_skills.items()}
+        self.roles = tuple(job_skills)
+        self.role_skills = MappingProxyType({role: tuple(skills) for role, skills in job_skills.items()})
+        # role -> {skill: importance}; the first listing wins if a role names a skill twice
+        self.role_importance = MappingProxyType({
+            role: MappingProxyType(dict(reversed(pairs))) for role, pairs in role_skills.items()
+        })
+        self.default_resources = MappingProxyType({
+            skill.lower(): tuple(MappingProxyType(dict(resource)) for resource in resources)
+            for skill, resources in default_resources.items()
+        })
+        self.certification_skills = MappingProxyType({
+            name.lower(): tuple(skills) for name, skills in certification_skills.items()
+        })
+        self.workshop_skills = MappingProxyType({
+            name.lower(): tuple(skills) for name, skills in workshop_skills.items()
+        })
+        self.aliases = MappingProxyType({alias.lower(): skill for alias, skill in skill_aliases.items()})
+        self.vocabulary = tuple(dict.fromkeys(skill for skills in job_skills.values() for skill in skills))
+        self.vocabulary_keys = tuple(skill.lower() for skill in self.vocabulary)
+        column = {skill: j for j, skill in enumerate(self.vocabulary)}
+        # Each role's skill columns in the role's own order
+        self.role_columns = tuple(
+            np.array([column[skill] for skill in dict.fromkeys(job_skills[role])], dtype=np.intp) for role in self.roles
+        )
+        role_matrix = np.zeros((len(self.roles), len(self.vocabulary)), dtype=np.float32)
+        for i, columns in enumerate(self.role_columns):
+            importance = self.role_importance[self.roles[i]]
+            role_matrix[i, columns] = [importance[self.vocabulary[j]] for j in columns]
+        role_sizes = np.maximum(role_matrix.sum(axis=1), 1)
+        for array in (role_matrix, role_sizes, *self.role_columns):
+            array.setflags(write=False)
+        self.role_matrix = role_matrix
+        self.role_sizes = role_sizes
+        # Plain (column, skill) pairs per role; listing one user's missing skills is faster in Python
+        self.role_skill_columns = tuple(
+            tuple((int(j), self.vocabulary[j]) for j in columns) for columns in self.role_columns
+        )
+        # Every known skill name -> its lower-cased form, so matching doesn't re-lower them
+        self.normalized = MappingProxyType({
+            skill: skill.lower()
+            for table in (job_skills, certification_skills, workshop_skills)
+            for skills in table.values()
+            for skill in skills
+        })
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__:
+            raise AttributeError(f"SkillTaxonomy is immutable; cannot reassign '{name}'")
+        super().__setattr__(name, value)
+
+    def normalize(self, skill):
+        return self.normalized.get(skill) or skill.lower()
+
+    def canonical(self, skill):
+        """The taxonomy's name for ``skill``, which may be one of its aliases"""
+        return self.aliases.get(skill.lower(), skill)
+
+    def skill_index(self, user_skills):
+        """Normalize a user's skills once into a single searchable string"""
+        # One lower() over the joined string rather than one per skill
+        index = SKILL_SEPARATOR.join(user_skills).lower()
+        if index.count(SKILL_SEPARATOR) >= len(user_skills):
+            # A skill contained the separator itself; strip it so matches can't straddle skills
+            index = SKILL_SEPARATOR.join(skill.replace(SKILL_SEPARATOR, '') for skill in user_skills).lower()
+        return index
+
+    def missing_skills(self, user_skills, required_skills, index=None):
+        """Required skills that aren't a substring of any user skill, in order.
+
+        Each required skill is one C-level search of the joined index instead of
+        a Python loop over every user skill. Pass ``index`` from skill_index()
+        to reuse it across roles.
+        """
+        if not user_skills:
+            return list(required_skills)
+        if index is None:
+            index = self.skill_index(user_skills)
+        normalize = self.normalize
+        return [skill for skill in required_skills if normalize(skill) not in index]
+
+    def skill_vector(self, user_skills):
+        """1.0 for each vocabulary skill the user has, by the same substring rule as missing_skills"""
+        if not user_skills:
+            return np.zeros(len(self.vocabulary), dtype=np.float32)
+        index = self.skill_index(user_skills)
+        return np.array([key in index for key in self.vocabulary_keys], dtype=np.float32)
+
+    def role_coverage(self, skill_vectors):
+        """Importance-weighted fraction of each role's skills covered: (users x vocabulary) in, (users x roles) out"""
+        return (np.atleast_2d(skill_vectors) @ self.role_matrix.T) / self.role_sizes
+
+    def cohort_coverage(self, user_skill_lists):
+        """role_coverage for many users at once, one row per user"""
+        if not user_skill_lists:
+            return np.zeros((0, len(self.roles)), dtype=np.float32)
+        return self.role_coverage(np.vstack([self.skill_vector(skills) for skills in user_skill_lists]))
+
+    def role_fit(self, user_skills):
+        """Coverage percentage and missing skills for every role, best covered first"""
+        present = self.skill_vector(user_skills)
+        coverage = self.role_coverage(present)[0].tolist()
+        have = present.tolist()
+        return [
+            {
+                'role': self.roles[i],
+                'coverage': round(coverage[i] * 100),
+                'missing': [skill for j, skill in self.role_skill_columns[i] if not have[j]],
+            }
+            for i in sorted(range(len(self.roles)), key=lambda i: -coverage[i])
+        ]
+
+    def required_skills(self, job_role):
+        return self.role_skills.get(job_role, ())
+
+    def resources_for(self, skill, limit):
+        """Predefined resources for a skill or one of its aliases as fresh dicts, or None when there are none"""
+        resources = self.default_resources.get(self.canonical(skill).lower())
+        if resources is None:
+            return None
+        return [dict(resource) for resource in resources[:limit]]
+
+
+class TaxonomyRegistry:
+    """Serves a process-local SkillTaxonomy snapshot built from JobRoleSkill.
+
+    ``get()`` runs no queries and, between VersionToken re-reads, no cache
+    round trips either. The snapshot is rebuilt only when the taxonomy token
+    has been replaced, which committing a change to a JobRoleSkill or Skill
+    does (see signals.py), so admin edits reach every worker within
+    VERSION_TOKEN_TTL seconds. If the rebuild fails, the previous snapshot
+    (or the hard-coded mapping) is kept until the next change. ``store`` is
+    the cache holding the token, the default cache unless given.
+    """
+
+    def __init__(self, store=None):
+        self._token = taxonomy_token if store is None else VersionToken(TAXONOMY_VERSION_KEY, store)
+        self._taxonomy = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        version = self._token.get()
+        taxonomy = self._taxonomy
+        if taxonomy is not None and version == self._version:
+            return taxonomy
+        with self._lock:
+            if self._taxonomy is None or version != self._version:
+                self._load(version)
+            return self._taxonomy
+
+    def reload(self):
+        with self._lock:
+            self._load(self._token.get())
+            return self._taxonomy
+
+    def _load(self, version):
+        try:
+            role_skills = stored_role_skills()
+        except DatabaseError as e:
+            logger.error(f"Keeping the current skill taxonomy, loading role skills failed: {str(e)}")
+            if self._taxonomy is None:
+                self._taxonomy = SkillTaxonomy(**source_data())
+        else:
+            self._taxonomy = SkillTaxonomy(**source_data(role_skills))
+        self._version = version
+
+
+taxonomy_registry = TaxonomyRegistry()
@@ -1,3 +1,1251 @@
-from django.test import TestCase
+import base64
+import itertools
+import json
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import threading
+import time
+import warnings
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import CacheKeyWarning
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from .batching import InferenceBatcher
+from .feature_encoding import CompiledEncoder
+from .http_client import CircuitOpen, Upstream
+from .job_feed import LISTING_FTS_TABLE, fetched_key_for, search_listings, search_term_for, store_listings
+from .learning_plans import PLAN_VERSION_KEY, learning_plan_for, plan_version
+from .model_registry import MANIFEST_NAME, ModelRegistry, ModelUnavailable, file_checksum, registry
+from .mlp_engine import CompiledMLP, NumpyMLP, compile_pipeline, export_mlp
+from .models import (
+    CachedSearch, Choice, JobListing, JobRoleSkill, LearningResource, Question, Skill, UserSkillGapAnalysis,
+)
+from .prediction_cache import LocalLRUCache, PredictionCache, prediction_cache
+from .prediction_table import PredictionTable, TableLayout
+from .predictor import FEATURE_COLUMNS, FEATURE_FIELDS, build_feature_row, job_roles, predict_one
+from .single_flight import RecentlyFailed, SingleFlight
+from .skill_analyzer import SkillGapAnalyzer
+from .skill_taxonomy import (
+    CERTIFICATION_SKILLS, JOB_SKILLS, WORKSHOP_SKILLS, TaxonomyRegistry, invalidate_taxonomy, taxonomy_registry,
+)
+from .quiz_service import QUIZ_VERSION_KEY, AnswerKey, answer_key, question_pool
+from .resource_search import fts_available, resolve_resources
+from .search_cache import cached_search, store_search
+from .version_tokens import VersionToken
 
 # Create your tests here.
+
+ARTIFACT_DIR = os.path.join(settings.BASE_DIR, 'prediction', 'models')
+
+
+def load_artifact(name):
+    with open(os.path.join(ARTIFACT_DIR, name), 'rb') as file:
+        return pickle.load(file)
+
+
+def random_records(count, seed=0):
+    """Form-style records with values drawn from the encoder's categories"""
+    rng = random.Random(seed)
+    encoder = load_artifact('encoder.pkl')
+    records = []
+    for _ in range(count):
+        record = {}
+        for (_, field, _, is_numeric), categories in zip(FEATURE_FIELDS, encoder.categories_):
+            record[field] = rng.randint(0, 9) if is_numeric else str(rng.choice(categories))
+        records.append(record)
+    return records
+
+
+def as_dataframe(rows):
+    """The DataFrame the prediction view fed the fitted encoder before it was compiled"""
+    return pd.DataFrame.from_dict(
+        {column: [row[i] for row in rows] for i, column in enumerate(FEATURE_COLUMNS)}
+    ).astype(str)
+
+
+def write_model_artifacts(directory, seed=0):
+    """Copy the encoder and scaler into ``directory`` with a small MLP trained on random records"""
+    from sklearn.exceptions import ConvergenceWarning
+    from sklearn.neural_network import MLPClassifier
+
+    for name in ('encoder.pkl', 'scaler.pkl'):
+        shutil.copy(os.path.join(ARTIFACT_DIR, name), directory)
+    encoder, scaler = load_artifact('encoder.pkl'), load_artifact('scaler.pkl')
+    rows = [build_feature_row(record) for record in random_records(400, seed)]
+    rng = random.Random(seed)
+    labels = [rng.choice(list(job_roles)) for _ in rows]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', ConvergenceWarning)
+        model = MLPClassifier(hidden_layer_sizes=(16,), max_iter=50, random_state=seed)
+        model.fit(scaler.transform(encoder.transform(as_dataframe(rows))), labels)
+    with open(os.path.join(directory, 'mlp_model.pkl'), 'wb') as file:
+        pickle.dump(model, file)
+    return model
+
+
+class ModelArtifactsMixin:
+    """Serves a small freshly trained model from a temporary PREDICTION_MODEL_DIR"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.model_dir = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.model_dir)
+        cls.model = write_model_artifacts(cls.model_dir)
+        cls.encoder, cls.scaler = load_artifact('encoder.pkl'), load_artifact('scaler.pkl')
+        cls.enterClassContext(override_settings(
+            PREDICTION_MODEL_DIR=cls.model_dir,
+            PREDICTION_TABLE_PATH=os.path.join(cls.model_dir, 'prediction_table.npy'),
+        ))
+
+    def setUp(self):
+        super().setUp()
+        registry.reload()
+
+    def sklearn_predict(self, rows):
+        return self.model.predict(self.scaler.transform(self.encoder.transform(as_dataframe(rows))))
+
+
+class BatchPredictionApiTests(ModelArtifactsMixin, SimpleTestCase):
+    def post(self, payload):
+        return self.client.post('/api/predict/batch/', payload, content_type='application/json', HTTP_HOST='localhost')
+
+    def test_batch_matches_the_fitted_pipeline(self):
+        records = random_records(50, seed=1)
+        response = self.post({'records': records})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['count'], 50)
+        self.assertEqual(body['model_version'], registry.get().version)
+        expected = self.sklearn_predict([build_feature_row(record) for record in records])
+        self.assertEqual([prediction['role'] for prediction in body['predictions']], [str(role) for role in expected])
+        for prediction in body['predictions']:
+            self.assertEqual(prediction['suggested_roles'], job_roles[prediction['role']])
+
+    @override_settings(PREDICTION_BATCH_CHUNK_SIZE=7)
+    def test_chunked_scoring_keeps_row_order(self):
+        records = random_records(30, seed=2)
+        chunked = self.post(records).json()['predictions']
+        with override_settings(PREDICTION_BATCH_CHUNK_SIZE=1000):
+            whole = self.post(records).json()['predictions']
+        self.assertEqual(chunked, whole)
+
+    def test_invalid_rows_are_reported_by_index(self):
+        records = random_records(4, seed=3)
+        records[1]['hackathons'] = 'many'
+        records[3] = 'not a record'
+        response = self.post(records)
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual([error['index'] for error in errors], [1, 3])
+        self.assertIn("'hackathons' must be an integer", errors[0]['error'])
+
+    @override_settings(PREDICTION_BATCH_MAX_RECORDS=3)
+    def test_oversized_batches_are_rejected(self):
+        response = self.post(random_records(4))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('At most 3 records', response.json()['error'])
+
+
+class CompiledEncoderTests(SimpleTestCase):
+    def setUp(self):
+        self.encoder = load_artifact('encoder.pkl')
+        self.compiled = CompiledEncoder(self.encoder)
+
+    def random_rows(self, count, seed=0):
+        """Rows like build_feature_row makes, a tenth of the values unknown to the encoder"""
+        rng = random.Random(seed)
+        return [
+            ['Unknown' if rng.random() < 0.1 else str(rng.choice(categories)) for categories in self.compiled.categories]
+            for _ in range(count)
+        ]
+
+    def test_matches_the_fitted_encoder(self):
+        rows = self.random_rows(2000)
+        expected = self.encoder.transform(as_dataframe(rows))
+        if hasattr(expected, 'toarray'):
+            expected = expected.toarray()
+        actual = self.compiled.transform(rows)
+        self.assertEqual(actual.dtype, expected.dtype)
+        np.testing.assert_array_equal(actual, expected)
+
+    def test_numeric_strings_do_not_match_integer_categories(self):
+        row = [build_feature_row(record) for record in random_records(1)][0]
+        numeric_columns = [i for i, categories in enumerate(self.compiled.categories) if not isinstance(categories[0], str)]
+        self.assertTrue(numeric_columns)
+        encoded = self.compiled.transform([row])[0]
+        for i in numeric_columns:
+            self.assertFalse(any(encoded[index] for index in self.compiled.lookups[i].values() if index is not None))
+
+    def test_unknown_categories_raise_when_the_encoder_does(self):
+        self.encoder.handle_unknown = 'error'
+        compiled = CompiledEncoder(self.encoder)
+        # Raw category values, so only the certification is unknown
+        row = [categories[0] for categories in self.compiled.categories]
+        self.encoder.transform(pd.DataFrame([row], columns=FEATURE_COLUMNS))
+        compiled.transform([row])
+        row[4] = 'Unknown'
+        with self.assertRaises(ValueError):
+            self.encoder.transform(pd.DataFrame([row], columns=FEATURE_COLUMNS))
+        with self.assertRaisesMessage(ValueError, "Found unknown category 'Unknown' in column 'certifications'"):
+            compiled.transform([row])
+
+
+@override_settings(PREDICTION_MODEL_RELOAD_INTERVAL=0)
+class ModelRegistryTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.source_dir = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.source_dir)
+        write_model_artifacts(cls.source_dir)
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.model_dir)
+
+    def publish(self, version, bad_checksum=None):
+        """Lay out a version directory and swap in its manifest, like publish_models"""
+        os.mkdir(os.path.join(self.model_dir, version))
+        artifacts = {}
+        for name, filename in (('model', 'mlp_model.pkl'), ('encoder', 'encoder.pkl'), ('scaler', 'scaler.pkl')):
+            target = os.path.join(self.model_dir, version, filename)
+            shutil.copy(os.path.join(self.source_dir, filename), target)
+            checksum = '0' * 64 if name == bad_checksum else file_checksum(target)
+            artifacts[name] = {'path': f'{version}/{filename}', 'sha256': checksum}
+        temp_path = os.path.join(self.model_dir, 'manifest.tmp')
+        with open(temp_path, 'w') as file:
+            json.dump({'version': version, 'artifacts': artifacts}, file)
+        os.replace(temp_path, os.path.join(self.model_dir, MANIFEST_NAME))
+
+    def test_nothing_is_loaded_before_first_use(self):
+        self.publish('v1')
+        models = ModelRegistry(self.model_dir)
+        self.assertFalse(models.status()['loaded'])
+        self.assertEqual(models.get().version, 'v1')
+        self.assertTrue(models.status()['loaded'])
+
+    def test_new_manifest_is_picked_up_without_a_restart(self):
+        self.publish('v1')
+        models = ModelRegistry(self.model_dir)
+        first = models.get()
+        self.publish('v2-hotfix')
+        second = models.get()
+        self.assertEqual(second.version, 'v2-hotfix')
+        self.assertIs(models.get(), second)
+        # In-flight requests keep the bundle they started with
+        self.assertEqual(first.version, 'v1')
+        self.assertEqual(first.predict_rows([[''] * len(FEATURE_COLUMNS)]).shape, (1,))
+
+    def test_checksum_mismatch_is_rejected(self):
+        self.publish('v1', bad_checksum='model')
+        with self.assertRaisesMessage(ModelUnavailable, 'Checksum mismatch for model artifact'):
+            ModelRegistry(self.model_dir).get()
+
+    def test_bad_release_keeps_the_current_version(self):
+        self.publish('v1')
+        models = ModelRegistry(self.model_dir)
+        models.get()
+        self.publish('v2-corrupt', bad_checksum='scaler')
+        with self.assertLogs('prediction.model_registry', 'ERROR') as logs:
+            self.assertEqual(models.get().version, 'v1')
+        self.assertIn('Checksum mismatch for scaler artifact', logs.output[0])
+
+
+class LocalLRUCacheTests(SimpleTestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        lru = LocalLRUCache(max_entries=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+        self.assertEqual(len(lru), 2)
+
+    def test_expired_entries_are_dropped(self):
+        lru = LocalLRUCache(max_entries=2, ttl=-1)
+        lru.set('a', 1)
+        self.assertIsNone(lru.get('a'))
+        self.assertEqual(len(lru), 0)
+
+
+class OfflinePredictionCache(PredictionCache):
+    """Fails the test if the shared cache is touched while ``offline`` is set"""
+
+    offline = False
+
+    @property
+    def shared(self):
+        if self.offline:
+            raise AssertionError('The shared prediction cache was used')
+        return super().shared
+
+
+# Keeps test predictions out of the file-based cache the dev server uses
+LOCAL_PREDICTION_CACHES = dict(settings.CACHES, predictions={
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'prediction-cache-tests',
+})
+
+
+@override_settings(CACHES=LOCAL_PREDICTION_CACHES)
+class PredictionCacheTests(SimpleTestCase):
+    row = ['7', '2', '8', '3', 'python', 'hacking', 'IOT', 'developer', 'BPA', 'Technical', 'yes', 'no']
+    scored = {'role': 'SE/SDE', 'suggested_roles': ['Software Engineer']}
+
+    def setUp(self):
+        self.predictions = OfflinePredictionCache()
+        self.predictions.shared.clear()
+
+    def test_counts_misses_then_local_hits(self):
+        self.assertIsNone(self.predictions.get('v1', self.row))
+        self.predictions.set('v1', self.row, self.scored)
+        self.assertEqual(self.predictions.get('v1', self.row), self.scored)
+        self.assertEqual(
+            self.predictions.stats(), {'local_hits': 1, 'shared_hits': 0, 'misses': 1, 'local_entries': 1}
+        )
+
+    def test_local_hits_do_no_shared_cache_io(self):
+        self.predictions.set('v1', self.row, self.scored)
+        self.predictions.offline = True
+        for _ in range(3):
+            self.assertEqual(self.predictions.get('v1', self.row), self.scored)
+        self.assertEqual(self.predictions.stats()['local_hits'], 3)
+
+    def test_another_worker_reuses_the_shared_entry(self):
+        self.predictions.set('v1', self.row, self.scored)
+        other_worker = PredictionCache()
+        self.assertEqual(other_worker.get('v1', self.row), self.scored)
+        self.assertEqual(other_worker.get('v1', self.row), self.scored)
+        stats = other_worker.stats()
+        self.assertEqual((stats['shared_hits'], stats['local_hits']), (1, 1))
+
+    def test_keys_depend_on_model_version_and_every_field(self):
+        self.predictions.set('v1', self.row, self.scored)
+        self.assertIsNone(self.predictions.get('v2', self.row))
+        self.assertIsNone(self.predictions.get('v1', self.row[:-1] + ['yes']))
+        # Joined fields can't collide across field boundaries
+        self.assertNotEqual(self.predictions.make_key('v1', ['ab', 'c']), self.predictions.make_key('v1', ['a', 'bc']))
+
+
+@override_settings(CACHES=LOCAL_PREDICTION_CACHES)
+class PredictOneTests(ModelArtifactsMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        prediction_cache.clear()
+        prediction_cache.shared.clear()
+
+    def test_repeat_submissions_skip_inference(self):
+        row = build_feature_row(random_records(1, seed=4)[0])
+        first = predict_one(row)
+        self.assertEqual(first['role'], str(self.sklearn_predict([row])[0]))
+        bundle = registry.get()
+        bundle_predict = bundle.predict_rows
+        bundle.predict_rows = None
+        try:
+            self.assertEqual(predict_one(row), first)
+        finally:
+            bundle.predict_rows = bundle_predict
+        self.assertEqual(prediction_cache.stats()['local_hits'], 1)
+
+
+class PredictionTableTests(ModelArtifactsMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.bundle = registry.get()
+        self.layout = TableLayout(self.bundle.compiled_encoder)
+        self.rows = [build_feature_row(record) for record in random_records(200, seed=5)]
+        self.rows[0][4] = 'Unknown'
+
+    def test_index_of_and_encode_range_agree_with_the_encoder(self):
+        indices = [self.layout.index_of(row) for row in self.rows]
+        self.assertTrue(all(0 <= index < self.layout.size for index in indices))
+        expected = self.bundle.compiled_encoder.transform(self.rows)
+        for index, encoded in zip(indices, expected):
+            np.testing.assert_array_equal(self.layout.encode_range(index, index + 1)[0], encoded)
+        start = min(indices)
+        np.testing.assert_array_equal(
+            self.layout.encode_range(start, start + 3)[0], self.layout.encode_range(start, start + 1)[0]
+        )
+
+    def test_every_index_names_one_row(self):
+        rng = random.Random(6)
+        for index in [0, self.layout.size - 1] + [rng.randrange(self.layout.size) for _ in range(200)]:
+            row = []
+            for values, radix, stride in zip(self.layout.values, self.layout.radices, self.layout.strides):
+                slot = index // stride % radix
+                row.append(values[slot - 1] if slot else 'Unknown')
+            self.assertEqual(self.layout.index_of(row), index)
+
+    def write_table(self, version):
+        """A table holding the model's predictions for self.rows (other entries are class 0)"""
+        classes = [str(label) for label in self.model.classes_]
+        labels = np.zeros(self.layout.size, dtype=np.uint8)
+        for row in self.rows:
+            index = self.layout.index_of(row)
+            encoded = self.layout.encode_range(index, index + 1)
+            labels[index] = classes.index(str(self.model.predict(self.scaler.transform(encoded))[0]))
+        path = os.path.join(self.model_dir, f'table-{version}.npy')
+        np.save(path, labels)
+        with open(PredictionTable.meta_path(path), 'w') as file:
+            json.dump({'version': version, 'classes': classes, 'layout': self.layout.describe()}, file)
+        return PredictionTable(path)
+
+    def test_lookup_matches_the_model(self):
+        table = self.write_table(self.bundle.version)
+        labels = table.lookup(self.rows, self.bundle)
+        self.assertEqual(list(labels), [str(label) for label in self.sklearn_predict(self.rows)])
+
+    def test_table_for_another_model_version_is_ignored(self):
+        table = self.write_table('some-other-version')
+        with self.assertLogs('prediction.prediction_table', 'WARNING'):
+            self.assertIsNone(table.lookup(self.rows, self.bundle))
+
+
+class MLPEngineTests(ModelArtifactsMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.rows = [build_feature_row(record) for record in random_records(300, seed=7)]
+        # Encoded sample rows plus off-distribution inputs
+        self.X = np.vstack([
+            self.scaler.transform(registry.get().compiled_encoder.transform(self.rows)),
+            np.random.default_rng(7).normal(size=(300, self.model.coefs_[0].shape[0])),
+        ])
+
+    def assert_same_outputs(self, model, engine, X):
+        expected = model.predict_proba(X)
+        actual = engine.predict_proba(X)
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+        np.testing.assert_array_equal(np.argmax(actual, axis=1), np.argmax(expected, axis=1))
+        np.testing.assert_array_equal(engine.predict(X), model.predict(X))
+
+    def test_numpy_engine_matches_sklearn(self):
+        export_mlp(self.model, self.directory, 'checksum')
+        self.assert_same_outputs(self.model, NumpyMLP(self.directory), self.X)
+
+    def test_numpy_engine_matches_sklearn_for_binary_models(self):
+        from sklearn.neural_network import MLPClassifier
+
+        labels = ['SE/SDE' if row[4] in ('python', 'full stack') else 'Analyst' for row in self.rows]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model = MLPClassifier(hidden_layer_sizes=(8,), activation='tanh', max_iter=50, random_state=0)
+            model.fit(self.X[:len(self.rows)], labels)
+        self.assertEqual(model.out_activation_, 'logistic')
+        export_mlp(model, self.directory, 'checksum')
+        self.assert_same_outputs(model, NumpyMLP(self.directory), self.X)
+
+    def test_registry_serves_exported_weights_for_the_same_pickle(self):
+        export_mlp(self.model, os.path.join(self.model_dir, 'mlp_weights'), file_checksum(
+            os.path.join(self.model_dir, 'mlp_model.pkl')
+        ))
+        self.addCleanup(shutil.rmtree, os.path.join(self.model_dir, 'mlp_weights'))
+        with override_settings(PREDICTION_COMPILED_MODEL=False):
+            bundle = registry.reload()
+        self.assertEqual(bundle.engine, 'numpy')
+        self.assertEqual(list(bundle.predict_rows(self.rows)), list(self.sklearn_predict(self.rows)))
+
+
+class CompiledMLPTests(ModelArtifactsMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.compiled_encoder = CompiledEncoder(self.encoder)
+        rng = random.Random(8)
+        self.rows = [build_feature_row(record) for record in random_records(150, seed=8)]
+        self.rows[0][5] = 'Unknown'
+        # Raw (non-string) categories must fold into the same lookups
+        self.rows += [[rng.choice(categories) for categories in self.compiled_encoder.categories] for _ in range(50)]
+
+    def compile(self, encoder=None):
+        compiled_encoder = CompiledEncoder(encoder) if encoder is not None else self.compiled_encoder
+        return CompiledMLP(self.directory, compile_pipeline(
+            self.model, compiled_encoder, self.scaler, self.directory, {'model': 'checksum'}
+        ))
+
+    def three_stage(self, rows):
+        return self.scaler.transform(self.compiled_encoder.transform(rows))
+
+    def test_probabilities_match_the_three_stage_pipeline(self):
+        compiled = self.compile()
+        for rows in (self.rows[:1], self.rows[:64], self.rows):
+            expected = self.model.predict_proba(self.three_stage(rows))
+            actual = compiled.predict_proba(rows)
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+            np.testing.assert_array_equal(np.argmax(actual, axis=1), np.argmax(expected, axis=1))
+            np.testing.assert_array_equal(compiled.predict_rows(rows), self.model.predict(self.three_stage(rows)))
+
+    def test_unknown_categories_raise_when_the_encoder_does(self):
+        encoder = load_artifact('encoder.pkl')
+        encoder.handle_unknown = 'error'
+        compiled = self.compile(encoder)
+        row = [categories[0] for categories in self.compiled_encoder.categories]
+        compiled.predict_rows([row])
+        row[6] = 'Unknown'
+        with self.assertRaisesMessage(ValueError, "Found unknown category 'Unknown' in column 'Interested subjects'"):
+            compiled.predict_rows([row])
+
+    def test_registry_serves_the_pipeline_compiled_from_its_artifacts(self):
+        bundle = registry.get()
+        directory = os.path.join(self.model_dir, 'compiled_model')
+        compile_pipeline(self.model, bundle.compiled_encoder, self.scaler, directory, bundle.checksums)
+        self.addCleanup(shutil.rmtree, directory)
+        bundle = registry.reload()
+        self.assertEqual(bundle.engine, 'compiled')
+        rows = self.rows[:150]
+        self.assertEqual(list(bundle.predict_rows(rows)), list(self.sklearn_predict(rows)))
+
+
+class EchoBundle:
+    """Stands in for a model bundle: labels each row with its first field and records batch sizes"""
+
+    def __init__(self, version='echo', fail=False):
+        self.version = version
+        self.fail = fail
+        self.batches = []
+
+    def predict_rows(self, rows):
+        self.batches.append(len(rows))
+        if self.fail:
+            raise RuntimeError('model exploded')
+        return [row[0] for row in rows]
+
+
+@override_settings(PREDICTION_TABLE_PATH=os.path.join(tempfile.gettempdir(), 'no-such-prediction-table.npy'))
+class InferenceBatcherTests(SimpleTestCase):
+    def setUp(self):
+        self.batcher = InferenceBatcher(max_batch_size=8, max_wait_ms=100)
+
+    def test_queued_rows_are_scored_in_batches(self):
+        bundle = EchoBundle()
+        futures = [self.batcher.submit([f'caller-{i}'], bundle=bundle) for i in range(20)]
+        results = [future.result(timeout=5) for future in futures]
+        self.assertEqual([result['role'] for result in results], [f'caller-{i}' for i in range(20)])
+        self.assertEqual(bundle.batches, [8, 8, 4])
+        stats = self.batcher.stats()
+        self.assertEqual((stats['batches'], stats['items'], stats['largest_batch']), (3, 20, 8))
+
+    def test_concurrent_callers_each_get_their_own_result(self):
+        bundle = EchoBundle()
+        results = {}
+
+        def call(i):
+            results[i] = self.batcher.predict([f'caller-{i}'], bundle=bundle, timeout=5)['role']
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {i: f'caller-{i}' for i in range(12)})
+        self.assertEqual(sum(bundle.batches), 12)
+        self.assertLess(len(bundle.batches), 12)
+
+    def test_model_versions_are_never_mixed(self):
+        old, new = EchoBundle('v1'), EchoBundle('v2')
+        futures = [self.batcher.submit([f'caller-{i}'], bundle=old if i % 2 else new) for i in range(6)]
+        self.assertEqual([future.result(timeout=5)['role'] for future in futures], [f'caller-{i}' for i in range(6)])
+        self.assertEqual((old.batches, new.batches), ([3], [3]))
+
+    def test_failures_reach_only_the_callers_in_that_batch(self):
+        broken, working = EchoBundle('v1', fail=True), EchoBundle('v2')
+        failing = self.batcher.submit(['a'], bundle=broken)
+        passing = self.batcher.submit(['b'], bundle=working)
+        with self.assertRaisesMessage(RuntimeError, 'model exploded'):
+            failing.result(timeout=5)
+        self.assertEqual(passing.result(timeout=5)['role'], 'b')
+
+
+class AnswerKeyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.answers = {}
+        self.correct = 0
+        # Run the token replacement a commit would, so the last test's bank is retired
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(20):
+                question = Question.objects.create(question_text=f'Question {i}')
+                right = Choice.objects.create(question=question, choice_text='right', is_correct=True)
+                wrong = Choice.objects.create(question=question, choice_text='wrong')
+                # Answer every third question wrongly
+                self.answers[question.pk] = wrong.pk if i % 3 == 0 else right.pk
+                self.correct += i % 3 != 0
+
+    def test_scoring_costs_at_most_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(answer_key.score(self.answers), self.correct)
+        with self.assertNumQueries(0):
+            self.assertEqual(answer_key.score(self.answers), self.correct)
+
+    def test_choice_from_another_question_is_not_correct(self):
+        question, other = list(self.answers)[:2]
+        right_for_other = Choice.objects.get(question_id=other, is_correct=True).pk
+        self.assertEqual(answer_key.score({question: right_for_other}), 0)
+
+    def test_changing_a_choice_invalidates_the_key(self):
+        answer_key.score(self.answers)
+        Choice.objects.filter(pk__in=self.answers.values()).update(is_correct=False)
+        # update() sends no signals; saving one choice through the model does
+        choice = Choice.objects.get(pk=next(iter(self.answers.values())))
+        choice.is_correct = True
+        with self.captureOnCommitCallbacks(execute=True):
+            choice.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(answer_key.score(self.answers), 1)
+
+    def test_another_worker_reloads_the_key(self):
+        # A second AnswerKey has its own process memory, like a key in another worker
+        worker = AnswerKey()
+        self.assertEqual(worker.score(self.answers), self.correct)
+        with self.captureOnCommitCallbacks(execute=True):
+            Choice.objects.filter(is_correct=True).delete()
+        # The version token lives where a fresh connection to the default cache reads it
+        self.assertIsNotNone(caches.create_connection('default').get(QUIZ_VERSION_KEY))
+        self.assertEqual(worker.score(self.answers), 0)
+
+    def test_submit_quiz_stores_score_in_session(self):
+        post = {f'question_{question}': choice for question, choice in self.answers.items()}
+        response = self.client.post('/submit/', post, HTTP_HOST='localhost')
+        self.assertRedirects(response, '/prediction/', fetch_redirect_response=False)
+        self.assertEqual(self.client.session['logical_quotient_rating'], self.correct)
+
+
+class QuestionPoolTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Run the token replacement a commit would, so the last test's bank is retired
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(50):
+                question = Question.objects.create(question_text=f'Question {i}')
+                Choice.objects.create(question=question, choice_text=f'Answer {i}', is_correct=True)
+                Choice.objects.create(question=question, choice_text=f'Distractor {i}')
+
+    def test_pool_loads_in_two_queries_and_renders_from_cache(self):
+        with self.assertNumQueries(2):
+            _, fragment = question_pool.render(0)
+        self.assertEqual(fragment.count('<fieldset'), 50)
+        self.assertIn('Distractor 49', fragment)
+        with self.assertNumQueries(0):
+            self.assertEqual(question_pool.render(0)[1], fragment)
+            question_pool.render(1)
+
+    def test_editing_a_question_refreshes_the_variants(self):
+        question_pool.render(0)
+        question = Question.objects.first()
+        question.question_text = 'Edited question'
+        with self.captureOnCommitCallbacks(execute=True):
+            question.save()
+            # Until the edit commits, the token stands and the loaded bank is served
+            self.assertNotIn('Edited question', question_pool.render(0)[1])
+        self.assertIn('Edited question', question_pool.render(0)[1])
+
+    def test_quiz_page_queries_do_not_grow_with_the_bank(self):
+        self.client.get('/quiz/', HTTP_HOST='localhost')
+        with self.assertNumQueries(0):
+            response = self.client.get('/quiz/', HTTP_HOST='localhost')
+        self.assertContains(response, 'name="question_', count=100)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers with the next status in ``server.statuses`` (200 once they run out)"""
+
+    def do_GET(self):
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.server.hits += 1
+        body = json.dumps({'status': status}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(HTTP_CLIENT_BACKOFF=0, HTTP_CLIENT_RETRIES=2,
+                   HTTP_CLIENT_BREAKER_THRESHOLD=3, HTTP_CLIENT_BREAKER_RESET=60)
+class HttpClientTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.statuses = []
+        self.server.hits = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/search'
+        self.upstream = Upstream('stub')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retries_transient_errors(self):
+        self.server.statuses = [503, 502]
+        response = self.upstream.request('GET', self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.hits, 3)
+        self.assertEqual(self.upstream.stats()['retries'], 2)
+
+    def test_breaker_fails_fast_while_upstream_is_down(self):
+        self.server.statuses = [500] * 10
+        self.assertEqual(self.upstream.request('GET', self.url).status_code, 500)
+        with self.assertRaises(CircuitOpen):
+            self.upstream.request('GET', self.url)
+        self.assertEqual(self.server.hits, 3)
+        self.assertEqual(self.upstream.stats()['circuit'], 'open')
+
+
+def adzuna_result(i, **overrides):
+    result = {
+        'id': str(1000 + i),
+        'created': f'2025-03-{1 + i % 28:02d}T10:00:00Z',
+        'title': f'Software Engineer {i}',
+        'company': {'display_name': 'Acme' if i % 2 else 'Globex'},
+        'location': {'display_name': 'Bangalore, Karnataka' if i % 3 else 'Pune, Maharashtra'},
+        'description': 'Build Python services' if i % 4 else 'Build Java services',
+        'salary_max': 1200000,
+        'redirect_url': f'https://example.com/jobs/{i}',
+    }
+    result.update(overrides)
+    return result
+
+
+class JobListingStoreTests(TestCase):
+    def setUp(self):
+        store_listings('SE/SDE', [adzuna_result(i) for i in range(45)])
+
+    def test_results_are_deduplicated_by_adzuna_id(self):
+        store_listings('SE/SDE', [adzuna_result(0, title='Renamed'), adzuna_result(0, title='Renamed')])
+        self.assertEqual(JobListing.objects.count(), 45)
+        self.assertEqual(JobListing.objects.get(adzuna_id='1000').title, 'Renamed')
+
+    def test_a_posting_keeps_every_category_it_was_fetched_for(self):
+        store_listings('Networks/ Systems', [adzuna_result(0)])
+        self.assertEqual(JobListing.objects.count(), 45)
+        listing = self.get(role='Networks/ Systems')['results']
+        self.assertEqual([job['adzuna_id'] for job in listing], ['1000'])
+        self.assertEqual(sorted(listing[0]['role_categories']), ['Networks/ Systems', 'SE/SDE'])
+        self.assertEqual(len(self.get(role='SE/SDE', page_size=100)['results']), 45)
+
+    def test_search_matches_a_substring_scan(self):
+        self.assertTrue(fts_available(LISTING_FTS_TABLE))
+        store_listings('SE/SDE', [adzuna_result(1, description='Build Rust services')])
+        listings = JobListing.objects.all()
+        for query in ['rust', 'python acme', 'JAVA pune', 'engineer 1', 'ace', 'nowhere']:
+            words = query.lower().split()
+            expected = {listing.pk for listing in listings if all(word in listing.search_text for word in words)}
+            self.assertEqual(set(search_listings(listings, query).values_list('pk', flat=True)), expected, query)
+
+    def get(self, **params):
+        return self.client.get('/api/jobs/', params, HTTP_HOST='localhost').json()
+
+    def test_keyset_pages_cover_every_listing_once(self):
+        seen = []
+        page = self.get(role='SE/SDE', page_size=10)
+        while True:
+            seen += [job['adzuna_id'] for job in page['results']]
+            if not page['next_cursor']:
+                break
+            page = self.get(role='SE/SDE', page_size=10, cursor=page['next_cursor'])
+        expected = list(JobListing.objects.order_by('-posted_at', '-id').values_list('adzuna_id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_search_and_filters(self):
+        results = self.get(q='python acme', location='Pune', page_size=100)['results']
+        self.assertTrue(results)
+        for job in results:
+            self.assertIn('Python', job['description'])
+            self.assertEqual(job['company'], 'Acme')
+            self.assertTrue(job['location'].startswith('Pune'))
+
+    def test_invalid_parameters_are_rejected_with_a_clear_message(self):
+        cases = [
+            ({'cursor': 'nope'}, "Invalid cursor 'nope'"),
+            ({'cursor': base64.urlsafe_b64encode(b'2025-03-01T10:00:00+00:00|x').decode()}, 'Invalid cursor'),
+            ({'page_size': 'ten'}, "page_size must be a whole number, got 'ten'"),
+            ({'posted_after': 'yesterday'}, "posted_after must be an ISO date, got 'yesterday'"),
+        ]
+        for params, message in cases:
+            response = self.client.get('/api/jobs/', params, HTTP_HOST='localhost')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(message, response.json()['error'])
+
+
+# In-process LocMem caches with one LOCATION share their storage, so separate
+# SingleFlight instances can stand in for workers; the in-memory SQLite test
+# database can't serve the database cache to many threads at once
+@override_settings(CACHES=dict(settings.CACHES, default={
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'single-flight-tests',
+}))
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def slow_fetch(self):
+        self.calls += 1
+        time.sleep(0.2)
+        return ['job']
+
+    def run_concurrently(self, flights, count=10):
+        results = []
+        threads = [
+            threading.Thread(target=lambda flight=flights[i % len(flights)]: results.append(
+                flight.run('SE/SDE', self.slow_fetch, negative_ttl=60)
+            ))
+            for i in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_threads_share_one_call(self):
+        results = self.run_concurrently([SingleFlight('test')])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [['job']] * 10)
+
+    def test_workers_coalesce_through_the_cache_lock(self):
+        # Separate instances stand in for separate worker processes
+        results = self.run_concurrently([SingleFlight('test'), SingleFlight('test')])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [['job']] * 10)
+
+    def test_failures_are_negatively_cached(self):
+        flight = SingleFlight('test')
+
+        def failing_fetch():
+            self.calls += 1
+            raise ConnectionError('upstream down')
+
+        with self.assertRaises(ConnectionError):
+            flight.run('SE/SDE', failing_fetch, negative_ttl=60)
+        with self.assertRaises(RecentlyFailed):
+            flight.run('SE/SDE', failing_fetch, negative_ttl=60)
+        self.assertEqual(self.calls, 1)
+
+
+class SharedCacheTests(TestCase):
+    def test_default_cache_is_shared_between_processes(self):
+        # Version tokens and single-flight locks do nothing if every worker has its own copy
+        self.assertNotIsInstance(caches['default'], LocMemCache)
+
+    def test_version_tokens_are_read_from_memory_between_checks(self):
+        token = VersionToken('test_version')
+        other_worker = VersionToken('test_version', caches.create_connection('default'))
+        first = token.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(token.get(), first)
+        replaced = other_worker.replace()
+        self.assertEqual(token.get(), first)
+        with override_settings(VERSION_TOKEN_TTL=0):
+            self.assertEqual(token.get(), replaced)
+
+    def test_keys_built_from_search_terms_are_valid_on_every_backend(self):
+        search_term = search_term_for('SE/SDE')
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            for key in [fetched_key_for('SE/SDE'), SingleFlight('test')._key('lock', search_term)]:
+                cache.validate_key(key)
+
+    @override_settings(SINGLE_FLIGHT_WAIT=0.2)
+    def test_another_worker_sees_the_fetch_lock(self):
+        flight, other_worker = SingleFlight('test'), SingleFlight('test')
+
+        def fetch():
+            with self.assertRaisesMessage(RecentlyFailed, 'Timed out waiting for another worker'):
+                other_worker.run('SE/SDE', lambda: ['duplicate'], negative_ttl=60)
+            return ['job']
+
+        self.assertEqual(flight.run('SE/SDE', fetch, negative_ttl=60), ['job'])
+
+    def test_results_of_earlier_fetches_are_not_reused(self):
+        flight = SingleFlight('test')
+        cache.set(flight._key('result', 'SE/SDE'), ('earlier-fetch', ['stale']), 60)
+        self.assertEqual(flight.run('SE/SDE', lambda: ['fresh'], negative_ttl=60), ['fresh'])
+
+
+class SkillTaxonomyTests(TestCase):
+    def test_taxonomy_is_built_once_and_shared(self):
+        self.assertIs(SkillGapAnalyzer().taxonomy, SkillGapAnalyzer().taxonomy)
+        self.assertIs(taxonomy_registry.get(), SkillGapAnalyzer().taxonomy)
+
+    def test_taxonomy_is_immutable(self):
+        taxonomy = taxonomy_registry.get()
+        with self.assertRaises(AttributeError):
+            taxonomy.version = 'changed'
+        with self.assertRaises(TypeError):
+            taxonomy.role_skills['SE/SDE'] = ()
+
+    def test_related_skills_and_gaps(self):
+        analyzer = SkillGapAnalyzer()
+        user_skills = analyzer.get_user_skills({'certifications': 'full stack', 'workshops': 'Unknown'})
+        self.assertIn('HTML/CSS', user_skills)
+        gaps = analyzer.identify_skill_gaps(user_skills, analyzer.get_required_skills('Mobile Applications/ Web Development'))
+        self.assertNotIn('JavaScript', gaps)
+        self.assertIn('React', gaps)
+
+    def test_predefined_resources_are_copies(self):
+        analyzer = SkillGapAnalyzer()
+        resources = analyzer.fetch_learning_resources('sql', limit=2)
+        self.assertEqual([resource['provider'] for resource in resources], ['W3Schools', 'Codecademy'])
+        resources[0]['title'] = 'changed'
+        self.assertEqual(analyzer.fetch_learning_resources('SQL')[0]['title'], 'SQL Basics')
+
+    def test_gap_matching_is_per_user_skill(self):
+        taxonomy = taxonomy_registry.get()
+        self.assertEqual(taxonomy.missing_skills(['Data Structures', 'Git'], ['Structures Git', 'git']), ['Structures Git'])
+        self.assertEqual(taxonomy.missing_skills(['Data\x00Structures'], ['datastructures']), [])
+        self.assertEqual(taxonomy.missing_skills([], ['SQL']), ['SQL'])
+
+    def test_aliases_only_resolve_resources(self):
+        taxonomy = taxonomy_registry.get()
+        self.assertEqual(taxonomy.canonical('ECMAScript'), 'JavaScript')
+        self.assertEqual(taxonomy.resources_for('Structured Query Language', 1), taxonomy.resources_for('SQL', 1))
+        self.assertEqual(taxonomy.missing_skills(['ECMAScript'], ['JavaScript']), ['JavaScript'])
+        self.assertFalse(taxonomy.skill_vector(['ECMAScript']).any())
+
+    def test_gaps_match_the_original_substring_rule_over_the_profile_grid(self):
+        analyzer = SkillGapAnalyzer()
+        grid = itertools.product(
+            [*CERTIFICATION_SKILLS, 'information security', 'Unknown'],
+            [*WORKSHOP_SKILLS, 'computer architecture', 'Unknown'],
+            ['Computer Architecture', 'data engineering', 'Cloud Computing', 'programming', 'Unknown'],
+            [0, 5, 8],
+            [0, 1, 3],
+            ['Technical', 'Management'],
+        )
+        for certification, workshop, subject, coding, hackathons, orientation in grid:
+            user_skills = analyzer.get_user_skills({
+                'certifications': certification, 'workshops': workshop, 'interested_subjects': subject,
+                'coding_skills_rating': coding, 'hackathons': hackathons, 'management_technical': orientation,
+                'public_speaking_points': 8, 'team': 'yes',
+            })
+            lowered = [skill.lower() for skill in user_skills]
+            for role in JOB_SKILLS:
+                required = analyzer.get_required_skills(role)
+                # The check identify_skill_gaps ran before the taxonomy was precompiled
+                expected = [skill for skill in required if not any(skill.lower() in s for s in lowered)]
+                self.assertEqual(analyzer.identify_skill_gaps(user_skills, required), expected)
+
+
+class SlowLookupAnalyzer(SkillGapAnalyzer):
+    """Stands in for DB and Google lookups with fixed per-skill delays"""
+
+    delays = {'Excel': 0.2, 'Git': 0.2, 'Figma': 1.5}
+
+    def stored_resources(self, skills, limit=3):
+        return {}
+
+    def search_resources(self, skill, limit=3, fallback=True):
+        time.sleep(self.delays.get(skill, 0))
+        return [{'title': f'{skill} guide'}]
+
+
+class FailingLookupAnalyzer(SlowLookupAnalyzer):
+    """Google is unreachable for every skill"""
+
+    def google_resources(self, skill, limit=3):
+        raise ConnectionError('google down')
+
+    def has_search_key(self):
+        return True
+
+    search_resources = SkillGapAnalyzer.search_resources
+
+
+class ConcurrentResourceLookupTests(TestCase):
+    def test_lookups_run_concurrently(self):
+        started = time.monotonic()
+        resources, timed_out, _ = SlowLookupAnalyzer().fetch_resources_concurrently(['Excel', 'Git'], deadline=2)
+        self.assertLess(time.monotonic() - started, 0.35)
+        self.assertEqual(timed_out, [])
+        self.assertEqual(resources['Git'], [{'title': 'Git guide'}])
+
+    def test_slow_lookups_fall_back_at_the_deadline(self):
+        started = time.monotonic()
+        resources, timed_out, _ = SlowLookupAnalyzer().fetch_resources_concurrently(['Excel', 'Figma'], deadline=0.5)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(timed_out, ['Figma'])
+        self.assertEqual(resources['Excel'], [{'title': 'Excel guide'}])
+        self.assertEqual(resources['Figma'][0]['provider'], 'Coursera')
+
+    @override_settings(SKILL_RESOURCE_DEADLINE=0.5)
+    def test_learning_plan_reports_timeouts(self):
+        plan = SlowLookupAnalyzer().create_learning_plan({}, 'UX/Design')
+        self.assertEqual(plan['resource_timeouts'], 1)
+        self.assertTrue(plan['degraded'])
+        self.assertEqual(len(plan['skill_gaps']), 7)
+
+    def test_failed_searches_fall_back_and_are_reported(self):
+        resources, timed_out, failed = FailingLookupAnalyzer().fetch_resources_concurrently(['Figma'])
+        self.assertEqual((timed_out, failed), ([], ['Figma']))
+        self.assertEqual(resources['Figma'][0]['provider'], 'Coursera')
+        # Single lookups still get the generic resources instead of an error
+        self.assertEqual(FailingLookupAnalyzer().search_resources('Figma')[0]['provider'], 'Coursera')
+
+
+class ResourceResolverTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        def add(skill_name, title, rating=None, is_premium=False):
+            skill, _ = Skill.objects.get_or_create(name=skill_name, category='Technical')
+            LearningResource.objects.create(
+                skill=skill, title=title, description='', url='https://example.com', resource_type='course',
+                provider='Example', difficulty='beginner', rating=rating, is_premium=is_premium,
+            )
+
+        add('Advanced Data Visualization', 'Dashboards in depth', rating=4.9)
+        add('Data Visualization', 'Charts 101', rating=4.0)
+        add('Data Visualization', 'Plotting basics', rating=4.5, is_premium=True)
+        add('Git', 'Pro Git')
+        add('R', 'R for Data Science')
+        add('Firewalls', 'Firewall rules')
+
+    def setUp(self):
+        # Backend capability check is cached per process; keep it out of the counts
+        fts_available()
+
+    def test_one_query_for_all_skills(self):
+        with self.assertNumQueries(1):
+            resources = resolve_resources(['Data Visualization', 'Git', 'R', 'Selenium'])
+        self.assertEqual(set(resources), {'Data Visualization', 'Git', 'R'})
+
+    def test_ranking_prefers_exact_names_then_rating(self):
+        titles = [card['title'] for card in resolve_resources(['data visualization'])['data visualization']]
+        self.assertEqual(titles, ['Plotting basics', 'Charts 101', 'Dashboards in depth'])
+        self.assertEqual(len(resolve_resources(['Data Visualization'], limit=2)['Data Visualization']), 2)
+
+    def test_cards_map_premium_to_is_free(self):
+        cards = resolve_resources(['Data Visualization'])['Data Visualization']
+        self.assertEqual([card['is_free'] for card in cards], [False, True, True])
+
+    def test_short_names_still_match_as_substrings(self):
+        # 'R' is below the trigram length and matches any skill name containing an r
+        names = {card['title'] for card in resolve_resources(['R'], limit=10)['R']}
+        self.assertEqual(names, {'R for Data Science', 'Firewall rules'})
+
+    def test_learning_plan_resources_take_one_query(self):
+        analyzer = SlowLookupAnalyzer()
+        analyzer.stored_resources = lambda skills, limit=3: resolve_resources(skills, limit)
+        with self.assertNumQueries(1):
+            resources, timed_out, _ = analyzer.fetch_resources_concurrently(['SQL', 'Git', 'Firewalls', 'Excel'])
+        self.assertEqual(resources['SQL'][0]['provider'], 'W3Schools')
+        self.assertEqual(resources['Git'][0]['title'], 'Pro Git')
+        self.assertEqual(resources['Excel'], [{'title': 'Excel guide'}])
+        self.assertEqual(timed_out, [])
+
+
+class CountingAnalyzer(SlowLookupAnalyzer):
+    delays = {}
+    plans_built = 0
+
+    def create_learning_plan(self, user_data, job_role):
+        CountingAnalyzer.plans_built += 1
+        return super().create_learning_plan(user_data, job_role)
+
+
+class FailingPlanAnalyzer(FailingLookupAnalyzer, CountingAnalyzer):
+    pass
+
+
+class LearningPlanCacheTests(TestCase):
+    user_data = {'coding_skills_rating': '7', 'certifications': 'python', 'team': 'yes'}
+
+    def setUp(self):
+        cache.clear()
+        CountingAnalyzer.plans_built = 0
+
+    def plan(self, user_data=None, session_id='session-a'):
+        return learning_plan_for(user_data or self.user_data, 'SE/SDE', session_id=session_id, analyzer=CountingAnalyzer())
+
+    def test_equal_inputs_share_a_plan_across_sessions(self):
+        first = self.plan()
+        second = self.plan(dict(self.user_data, coding_skills_rating=7), session_id='session-b')
+        self.assertEqual(first, second)
+        self.assertEqual(CountingAnalyzer.plans_built, 1)
+        self.assertEqual(UserSkillGapAnalysis.objects.filter(session_id='session-a').count(), 1)
+
+    def test_memoized_plan_costs_one_query_and_survives_a_cache_flush(self):
+        first = self.plan()
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.plan(), first)
+        self.assertEqual(CountingAnalyzer.plans_built, 1)
+
+    def test_resource_changes_retire_plans(self):
+        self.plan()
+        version = plan_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = Skill.objects.create(name='Git', category='Technical')
+            LearningResource.objects.create(
+                skill=skill, title='Pro Git', description='', url='https://example.com', resource_type='book',
+                provider='Example', difficulty='beginner',
+            )
+            self.assertEqual(plan_version(), version)
+        # Every worker reads the new token from the shared cache
+        self.assertNotEqual(caches.create_connection('default').get(PLAN_VERSION_KEY), version)
+        self.plan()
+        self.assertEqual(CountingAnalyzer.plans_built, 2)
+
+    def test_bulk_edits_replace_each_token_once(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for i in range(20):
+                Skill.objects.create(name=f'Skill {i}', category='Technical')
+        # One for the learning plans, one for the taxonomy
+        self.assertEqual(len(callbacks), 2)
+
+    @override_settings(SKILL_RESOURCE_DEADLINE=0.5)
+    def test_plans_with_timed_out_lookups_are_not_memoized(self):
+        CountingAnalyzer.delays = {'Algorithms': 1}
+        try:
+            self.plan()
+            self.plan()
+        finally:
+            CountingAnalyzer.delays = {}
+        self.assertEqual(CountingAnalyzer.plans_built, 2)
+        self.assertFalse(UserSkillGapAnalysis.objects.exists())
+
+    def test_plans_with_failed_lookups_are_not_memoized(self):
+        for _ in range(2):
+            plan = learning_plan_for(self.user_data, 'SE/SDE', analyzer=FailingPlanAnalyzer())
+        self.assertTrue(plan['degraded'])
+        self.assertEqual(plan['resource_failures'], len(plan['skill_gaps']))
+        self.assertEqual(CountingAnalyzer.plans_built, 2)
+        self.assertFalse(UserSkillGapAnalysis.objects.exists())
+
+
+class CountingSearchAnalyzer(SkillGapAnalyzer):
+    calls = 0
+
+    def google_resources(self, skill, limit=3):
+        CountingSearchAnalyzer.calls += 1
+        return [{'title': f'{skill} course {i}'} for i in range(limit)]
+
+
+@override_settings(GOOGLE_API_KEY='test-key', GOOGLE_SEARCH_CACHE_MAX_ENTRIES=2)
+class SearchCacheTests(TestCase):
+    def setUp(self):
+        CountingSearchAnalyzer.calls = 0
+
+    def test_queries_are_sent_once(self):
+        analyzer = CountingSearchAnalyzer()
+        first = analyzer.search_resources('Figma')
+        self.assertEqual(analyzer.search_resources('figma'), first)
+        self.assertEqual(CountingSearchAnalyzer.calls, 1)
+        self.assertEqual(analyzer.search_resources('Figma', limit=2), first[:2])
+        self.assertEqual(CountingSearchAnalyzer.calls, 1)
+
+    def test_larger_limits_and_expired_entries_miss(self):
+        store_search('SQL  Tutorial', [{'title': 'a'}], 1)
+        self.assertEqual(cached_search('sql tutorial', 1), [{'title': 'a'}])
+        self.assertIsNone(cached_search('sql tutorial', 3))
+        with override_settings(GOOGLE_SEARCH_CACHE_TTL=0):
+            self.assertIsNone(cached_search('sql tutorial', 1))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        store_search('git', [], 3)
+        store_search('figma', [], 3)
+        CachedSearch.objects.filter(query='figma').update(last_used_at=timezone.now() - timedelta(days=1))
+        store_search('selenium', [], 3)
+        self.assertEqual(set(CachedSearch.objects.values_list('query', flat=True)), {'git', 'selenium'})
+
+
+class RoleMatrixTests(TestCase):
+    profiles = [
+        {'certifications': 'full stack', 'workshops': 'data science', 'coding_skills_rating': 8},
+        {'management_technical': 'Management', 'public_speaking_points': 9, 'team': 'yes'},
+        {'certifications': 'information security', 'workshops': 'cloud computing'},
+        {},
+    ]
+
+    def test_role_fit_matches_per_role_gap_analysis(self):
+        analyzer = SkillGapAnalyzer()
+        for user_data in self.profiles:
+            user_skills = analyzer.get_user_skills(user_data)
+            for fit in analyzer.role_fit(user_data):
+                required = analyzer.get_required_skills(fit['role'])
+                missing = analyzer.identify_skill_gaps(user_skills, required)
+                self.assertEqual(fit['missing'], missing)
+                self.assertEqual(fit['coverage'], round(100 * (len(required) - len(missing)) / len(required)))
+
+    def test_role_fit_is_sorted_by_coverage(self):
+        coverages = [fit['coverage'] for fit in SkillGapAnalyzer().role_fit(self.profiles[1])]
+        self.assertEqual(coverages, sorted(coverages, reverse=True))
+        self.assertGreater(coverages[0], 0)
+
+    def test_cohort_coverage_matches_single_users(self):
+        analyzer = SkillGapAnalyzer()
+        coverage = analyzer.cohort_coverage(self.profiles)
+        self.assertEqual(coverage.shape, (len(self.profiles), len(analyzer.taxonomy.roles)))
+        for row, user_data in zip(coverage, self.profiles):
+            by_role = {fit['role']: fit['coverage'] for fit in analyzer.role_fit(user_data)}
+            self.assertEqual([round(value * 100) for value in row], [by_role[role] for role in analyzer.taxonomy.roles])
+
+
+class StoredRoleSkillTests(TestCase):
+    def setUp(self):
+        invalidate_taxonomy()
+
+    def tearDown(self):
+        # Rolled-back rows send no signals; don't leave their snapshot behind
+        invalidate_taxonomy()
+
+    def add(self, role, name, importance):
+        with self.captureOnCommitCallbacks(execute=True):
+            skill, _ = Skill.objects.get_or_create(name=name, category='Technical')
+            return JobRoleSkill.objects.create(job_role=role, skill=skill, importance=importance)
+
+    def test_hard_coded_mapping_until_rows_exist(self):
+        self.assertEqual(SkillGapAnalyzer().get_required_skills('SE/SDE'), JOB_SKILLS['SE/SDE'])
+
+    def test_rows_replace_the_mapping_ordered_by_importance(self):
+        self.add('SE/SDE', 'Git', 3)
+        self.add('SE/SDE', 'Python', 9)
+        analyzer = SkillGapAnalyzer()
+        self.assertEqual(analyzer.get_required_skills('SE/SDE'), ['Python', 'Git'])
+        # Roles without stored rows keep their hard-coded skills
+        self.assertEqual(analyzer.taxonomy.roles, tuple(JOB_SKILLS))
+        self.assertEqual(analyzer.get_required_skills('Analyst'), JOB_SKILLS['Analyst'])
+        fit = analyzer.taxonomy.role_fit(['Python'])[0]
+        self.assertEqual(fit['coverage'], 75)
+        self.assertEqual(fit['missing'], ['Git'])
+
+    def test_snapshot_is_served_without_queries_until_a_change(self):
+        role_skill = self.add('Analyst', 'SQL', 8)
+        first = taxonomy_registry.get()
+        with self.assertNumQueries(0):
+            self.assertIs(taxonomy_registry.get(), first)
+            self.assertEqual(SkillGapAnalyzer().get_required_skills('Analyst'), ['SQL'])
+
+        role_skill.importance = 2
+        with self.captureOnCommitCallbacks(execute=True):
+            role_skill.save()
+            # Until the edit commits, workers keep the committed snapshot
+            self.assertIs(taxonomy_registry.get(), first)
+        self.add('Analyst', 'Excel', 6)
+        self.assertEqual(SkillGapAnalyzer().get_required_skills('Analyst'), ['Excel', 'SQL'])
+        with self.captureOnCommitCallbacks(execute=True):
+            role_skill.delete()
+        self.assertEqual(SkillGapAnalyzer().get_required_skills('Analyst'), ['Excel'])
+
+    @override_settings(VERSION_TOKEN_TTL=0)
+    def test_edits_reach_a_worker_with_its_own_cache_connection(self):
+        # A separate registry and cache instance stand in for another worker process
+        worker = TaxonomyRegistry(caches.create_connection('default'))
+        self.assertEqual(worker.get().required_skills('Analyst'), tuple(JOB_SKILLS['Analyst']))
+        self.add('Analyst', 'SQL', 8)
+        self.assertEqual(worker.get().required_skills('Analyst'), ('SQL',))
@@ -1,6 +1,7 @@
 from django.urls import path
 from . import views
 from . import gamification_views
+from . import api_views
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -13,6 +14,12 @@ urlpatterns = [
     path('roadmap/', views.roadmap, name='roadmap'),
     path('job/', views.job_view, name='job'),  # New URL pattern for job page
     
+    # Prediction API URLs
+    path('api/predict/batch/', api_views.predict_batch_view, name='api_predict_batch'),
+    path('api/predict/model/', api_views.model_status, name='api_model_status'),
+    path('api/upstreams/', api_views.upstream_status, name='api_upstream_status'),
+    path('api/jobs/', api_views.job_listings, name='api_job_listings'),
+    
     # Gamification API URLs
     path('api/gamification/profile/<str:user_id>/', gamification_views.user_profile, name='api_user_profile'),
     path('api/gamification/roadmap/<str:domain>/stages/', gamification_views.roadmap_stages, name='api_roadmap_stages'),
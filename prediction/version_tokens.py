@@ -0,0 +1,72 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class VersionToken:
+    """A token in the shared cache, replaced whenever the data it versions changes.
+
+    Workers keep in-memory copies of that data tagged with the token they were
+    built under. ``get()`` re-reads the shared token at most once every
+    VERSION_TOKEN_TTL seconds per process and otherwise costs no cache round
+    trip, so a replacement made by another worker is seen within that delay
+    and one made by this process at once. ``store`` is the cache holding the
+    token, the default cache unless given.
+    """
+
+    def __init__(self, key, store=None):
+        self.key = key
+        self._store = store
+        # (token, monotonic time it was read); one tuple so threads never see a torn pair
+        self._local = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        return cache if self._store is None else self._store
+
+    def get(self):
+        local = self._local
+        if local is not None and time.monotonic() - local[1] < settings.VERSION_TOKEN_TTL:
+            return local[0]
+        with self._lock:
+            value = self.store.get(self.key)
+            if value is None:
+                self.store.add(self.key, uuid.uuid4().hex, None)
+                value = self.store.get(self.key)
+            self._local = (value, time.monotonic())
+            return value
+
+    def replace(self):
+        value = uuid.uuid4().hex
+        self.store.set(self.key, value, None)
+        self._local = (value, time.monotonic())
+        return value
+
+    def replace_on_commit(self, using=None):
+        """Replace the token once the current transaction commits, however often this is called in it.
+
+        Workers must not rebuild from rows that aren't committed yet, and a
+        bulk edit saving hundreds of rows should still cost one replacement.
+        """
+        connection = transaction.get_connection(using)
+        for _, callback, _ in connection.run_on_commit:
+            if isinstance(callback, PendingReplacement) and callback.token is self and not callback.done:
+                return
+        transaction.on_commit(PendingReplacement(self), using=using)
+
+
+class PendingReplacement:
+    """An on-commit callback replacing ``token``; remembers whether it has run"""
+
+    def __init__(self, token):
+        self.token = token
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        self.token.replace()
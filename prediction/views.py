@@ -1,15 +1,9 @@
 from django.shortcuts import render, redirect
-from .models import Roadmap, Question, Choice
-import pickle , os
-from django.conf import settings
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import LabelEncoder
+from .models import Roadmap
 
 # Add to the top of views.py
+from .learning_plans import learning_plan_for
 from .skill_analyzer import SkillGapAnalyzer
-import json
-from django.http import JsonResponse
 
 
 # model = pickle.load(open("prediction/models/best_student_job_role_model.pkl","rb"))
@@ -21,15 +15,10 @@ from django.http import JsonResponse
 # scaler = pickle.load(open("prediction/models/scalar.pkl", "rb"))
 # over_sample = pickle.load(open("prediction/models/over_sampling.pkl", "rb"))
 
-# Load the saved model, encoder, and scaler
-with open("prediction/models/mlp_model.pkl", 'rb') as file:
-    loaded_model = pickle.load(file)
-
-with open("prediction/models/encoder.pkl", 'rb') as file:
-    loaded_encoder = pickle.load(file)
-
-with open("prediction/models/scaler.pkl", 'rb') as file:
-    loaded_scaler = pickle.load(file)
+# The saved model, encoder, and scaler are loaded lazily by model_registry.py
+from .model_registry import ModelUnavailable
+from .predictor import build_feature_row, predict_one
+from .quiz_service import answer_key, question_pool, submitted_answers
 
     
 def home(request):
@@ -260,45 +249,15 @@ def prediction(request):
         request.session['team'] = request.POST.get('team', "No")
         request.session['introvert'] = request.POST.get('introvert', "No")
 
-        input_data_dict = {
-            "Logical quotient rating": [score],
-            "hackathons": [int(request.POST.get('hackathons', "0"))],
-            "coding skills rating": [int(request.POST.get('coding_skills', "0"))],
-            "public speaking points": [int(request.POST.get('public_speaking_points', "0"))],
-            "certifications": [request.POST.get('certifications', "Unknown")],
-            "workshops": [request.POST.get('workshops', "Unknown")],
-            "Interested subjects": [request.POST.get('interested_subjects', "Unknown")],
-            "interested career area ": [request.POST.get('interested_career_area', "Unknown")],
-            "Type of company want to settle in?": [request.POST.get('Type_of_company_want_to_settle_in', "Unknown")],
-            "Management or Technical": [request.POST.get('management_technical', "Unknown")],
-            "worked in teams ever?": [request.POST.get('team', "No")],
-            "Introvert": [request.POST.get('introvert', "No")]
-        }
-
-        input_df = pd.DataFrame.from_dict(input_data_dict)
-        input_df = input_df.astype(str)
-
-        new_data_encoded = loaded_encoder.transform(input_df)
-        new_data_scaled = loaded_scaler.transform(new_data_encoded)
-
-        prediction = loaded_model.predict(new_data_scaled)
-        result = prediction[0]
-        
-        job_roles = {
-            'CRM/Managerial Roles': ['CRM Business Analyst', 'CRM Technical Developer', 'Project Manager', 'Information Technology Manager'],
-            'Analyst': ['Business Systems Analyst', 'Business Intelligence Analyst', 'E-Commerce Analyst'],
-            'Mobile Applications/ Web Development': ['Mobile Applications Developer', 'Web Developer', 'Applications Developer'],
-            'QA/Testing': ['Software Quality Assurance (QA) / Testing', 'Quality Assurance Associate'],
-            'UX/Design': ['UX Designer', 'Design & UX'],
-            'Databases': ['Database Developer', 'Database Administrator', 'Database Manager', 'Portal Administrator'],
-            'Programming/ Systems Analyst': ['Programmer Analyst', 'Systems Analyst'],
-            'Networks/ Systems': ['Network Security Administrator', 'Network Security Engineer', 'Network Engineer', 'Systems Security Administrator', 'Software Systems Engineer', 'Information Security Analyst'],
-            'SE/SDE': ['Software Engineer', 'Software Developer'],
-            'Technical Support/Service': ['Technical Engineer', 'Technical Services/Help Desk/Tech Support', 'Technical Support'],
-            'others': ['Solutions Architect', 'Data Architect', 'Information Technology Auditor']
-        }
-
-        suggested_roles = job_roles.get(result, ['Unknown'])
+        feature_row = build_feature_row(request.POST, score)
+        try:
+            scored = predict_one(feature_row)
+        except ModelUnavailable as e:
+            print(f"Error in prediction: {str(e)}")
+            show_data['error'] = "Predictions are temporarily unavailable. Please try again later."
+            return render(request, 'prediction.html', show_data)
+        result = scored['role']
+        suggested_roles = scored['suggested_roles']
         
         show_data.update({
             "hackathons": request.POST.get('hackathons', "0"),
@@ -328,103 +287,14 @@ def prediction(request):
 
 
 
-# Add these imports at the top
-import requests
-from datetime import datetime
-import os
-from django.core.cache import cache
+from .job_feed import job_refresher
 
 def fetch_jobs_from_adzuna(job_category, num_jobs=5):
-    """Fetch jobs from Adzuna API with improved category mapping and error handling"""
-    # Map the predicted role categories to relevant job search terms
-    job_search_mapping = {
-        'CRM/Managerial Roles': 'CRM Manager OR Project Manager',
-        'Analyst': 'Business Analyst OR Data Analyst',
-        'Mobile Applications/ Web Development': 'Web Developer OR Mobile Developer',
-        'QA/Testing': 'QA Engineer OR Software Tester',
-        'UX/Design': 'UX Designer OR UI Designer',
-        'Databases': 'Database Administrator OR Database Developer',
-        'Programming/ Systems Analyst': 'Systems Analyst OR Programmer',
-        'Networks/ Systems': 'Network Engineer OR Systems Administrator',
-        'SE/SDE': 'Software Engineer OR Software Developer',
-        'Technical Support/Service': 'Technical Support OR IT Support',
-        'others': 'IT Professional'
-    }
+    """Return stored Adzuna listings for a role category without waiting on the API.
 
-    # Get the appropriate search term
-    search_term = job_search_mapping.get(job_category, job_category)
-    
-    # Cache key based on search term
-    cache_key = f'jobs_{search_term}'
-    
-    # Try to get cached results first
-    cached_results = cache.get(cache_key)
-    if cached_results:
-        return cached_results
-
-    # Your Adzuna API credentials
-    app_id = settings.ADZUNA_APP_ID
-    app_key = settings.ADZUNA_APP_KEY
-    
-    # Base URL for Adzuna API
-    base_url = "https://api.adzuna.com/v1/api/jobs/in/search/1"
-    
-    # Parameters for the API request
-    params = {
-        'app_id': app_id,
-        'app_key': app_key,
-        'results_per_page': num_jobs,
-        'what': search_term,
-        'content-type': 'application/json',
-        'sort_by': 'date',
-        'max_days_old': 30  # Only show jobs posted in last 30 days
-    }
-    
-    try:
-        response = requests.get(base_url, params=params, timeout=10)  # Add timeout
-        response.raise_for_status()
-        data = response.json()
-        
-        # Process and format the job listings
-        jobs = []
-        for job in data.get('results', [])[:num_jobs]:
-            # Format the date
-            created_at = datetime.strptime(job['created'], "%Y-%m-%dT%H:%M:%SZ")
-            formatted_date = created_at.strftime("%B %d, %Y")
-            
-            # Clean and truncate description
-            description = job.get('description', 'No description available')
-            if len(description) > 300:
-                description = description[:300] + '...'
-            
-            # Format salary
-            salary_min = job.get('salary_min')
-            salary_max = job.get('salary_max')
-            if salary_min and salary_max:
-                salary = f"₹{salary_min/100000:.1f}L - ₹{salary_max/100000:.1f}L"
-            elif salary_max:
-                salary = f"Up to ₹{salary_max/100000:.1f}L"
-            else:
-                salary = "Salary not specified"
-            
-            jobs.append({
-                'title': job.get('title'),
-                'company': job.get('company', {}).get('display_name', 'Company not specified'),
-                'location': job.get('location', {}).get('display_name', 'Location not specified'),
-                'description': description,
-                'salary': salary,
-                'url': job.get('redirect_url'),
-                'posted_date': formatted_date
-            })
-        
-        # Cache the results for 1 hour (3600 seconds)
-        cache.set(cache_key, jobs, 3600)
-        
-        return jobs
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching jobs: {str(e)}")
-        # Return empty list in case of error
-        return []
+    Stale or missing listings are refreshed in the background (see job_feed.py).
+    """
+    return job_refresher.cached_jobs(job_category, limit=num_jobs)
 
 # Add this new view function
 def skill_gap_analysis(request):
@@ -452,11 +322,8 @@ def skill_gap_analysis(request):
             'introvert': request.session.get('introvert', '')
         }
         
-        # Create a skill gap analyzer
-        analyzer = SkillGapAnalyzer()
-        
-        # Create a learning plan
-        learning_plan = analyzer.create_learning_plan(user_data, result)
+        # Reuse the learning plan memoized for these inputs, or create one
+        learning_plan = learning_plan_for(user_data, result, session_id=request.session.session_key)
         
         # Store learning plan in session for future use
         request.session['learning_plan'] = learning_plan
@@ -596,21 +463,22 @@ def job_view(request):
         'introvert': request.session.get('introvert', '')
     }
     
-    # Create a skill gap analyzer
-    analyzer = SkillGapAnalyzer()
-    
-    # Create a learning plan
-    learning_plan = analyzer.create_learning_plan(user_data, result)
+    # Reuse the learning plan memoized for these inputs, or create one
+    learning_plan = learning_plan_for(user_data, result, session_id=request.session.session_key)
     
     # Store learning plan in session for future use
     request.session['learning_plan'] = learning_plan
     
+    # The user's skill coverage for every role at once, for the alternatives list
+    role_fit = SkillGapAnalyzer().role_fit(user_data)
+    
     context = {
         'result': result,
         'roadmap': roadmap,
         'cat': cat,
         'job_listings': job_listings,
-        'learning_plan': learning_plan
+        'learning_plan': learning_plan,
+        'alternative_roles': [fit for fit in role_fit if fit['role'] != result][:3]
     }
         
     return render(request, 'job.html', context)
@@ -627,9 +495,9 @@ def quiz_view(request):
         del request.session['logical_quotient_rating']
     if 'quiz_taken' in request.session:
         del request.session['quiz_taken']
-    questions = Question.objects.all()
     # score = request.session.get('logical_quotient_rating', None)  # Retrieve score from session
-    return render(request, 'quiz.html', {'questions': questions})
+    variant, questions_html = question_pool.render()
+    return render(request, 'quiz.html', {'questions_html': questions_html, 'variant': variant})
 
 # def submit_quiz(request):
 #     if request.method == 'POST':
@@ -651,11 +519,8 @@ def quiz_view(request):
 
 def submit_quiz(request):
     if request.method == 'POST':
-        score = 0
-        for question_id, choice_id in request.POST.items():
-            if question_id.startswith('question_'):
-                if Choice.objects.get(pk=choice_id).is_correct:
-                    score += 1
+        # Scored against the cached answer key instead of one query per answer
+        score = answer_key.score(submitted_answers(request.POST))
 
         # Store score and quiz completion status in session
         request.session['logical_quotient_rating'] = score